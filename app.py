@@ -5,25 +5,84 @@
 =========================================="""
 
 # Import Necessary Modules
+import asyncio
+import logging
 import os
+import time
+import uuid
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from typing import List, Optional
 
+import numpy as np
+import orjson
 import uvicorn
 
-from fastapi import FastAPI, File, UploadFile, status
+from fastapi import BackgroundTasks, FastAPI, File, Form, Header, UploadFile, status
 from fastapi.exceptions import HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from service.region_detection_service.object_detection_processor import RegionExtractor
+from service.region_detection_service import metrics
+from service.region_detection_service.batch_scheduler import BatchScheduler
+from service.region_detection_service.model_registry import ModelRegistry
+from service.region_detection_service.object_detection_processor import RegionExtractor, resolve_label_ids
+from service.region_detection_service.region_encoding import (JSON_FORMAT, negotiate_format, region_count,
+                                                              response_class)
+from service.region_detection_service.region_renderer import RegionRenderer
+from service.region_detection_service.result_cache import ResultCache
+from service.region_detection_service.single_flight import SingleFlight
+from service.region_detection_service.worker_pool import InferenceWorkerPool, PoolSaturatedError
 
-from src.utils_files.config_reader import ConfigReader
-from src.utils_files.file_utils import save_image_from_server, save_uploaded_file
+from src.utils_files import settings as app_settings
+from src.utils_files import util
+from src.utils_files.file_utils import decode_image_bytes, save_image_bytes
+from src.utils_files.image_fetcher import ImageFetcher, ImageFetchError
 
-# Load configuration from config.ini
-config_mgr = ConfigReader().config_reader()
+from yolo.ultralytics.data.augment import LetterBox
+from yolo.ultralytics.engine.predictor_pool import default_pool_size
 
-# Create a FastAPI instance
-app = FastAPI()
+# Cold start is measured from here until the model is warmed and /ready reports ready
+_STARTUP_TIME = time.perf_counter()
+
+# Load configuration from config.ini (and REGION_* environment overrides) once
+settings = app_settings.get_settings()
+
+# Set up the logging pipeline once per process, records are written to disk by a background listener
+_logger = logging.getLogger(__name__)
+util.setup_root_logger(settings.logging.file_prefix, max_bytes=settings.logging.max_bytes,
+                       backup_count=settings.logging.backup_count, log_format=settings.logging.format)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm the model and start the batch scheduler and image fetcher with the server, then report ready.
+    On shutdown stop reporting ready and release them (logs are flushed last).
+    """
+    loop = asyncio.get_running_loop()
+    warmup_time = await loop.run_in_executor(None, warmup_detector, detector, WARMUP_BATCH_SIZES)
+    await batch_scheduler.start()
+    await image_fetcher.start()
+    # SIGHUP re-reads config.ini and re-registers the YOLO model without a restart
+    app_settings.install_reload_signal(loop)
+    app.state.ready = True
+    _logger.info("Server ready, cold start took %.3fs (warmup of batch sizes %s: %.3fs)",
+                 time.perf_counter() - _STARTUP_TIME, list(WARMUP_BATCH_SIZES), warmup_time)
+    yield
+    app.state.ready = False
+    await image_fetcher.close()
+    await batch_scheduler.stop()
+    worker_pool.shutdown()
+    region_renderer.shutdown()
+    if result_cache is not None:
+        result_cache.close()
+    util.shutdown_root_logger()
+
+
+# Create a FastAPI instance, it reports ready once the lifespan startup has warmed the model
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.state.ready = False
 
 # CORS (Cross-Origin Resource Sharing) middleware to allow requests from any origin
 app.add_middleware(
@@ -35,18 +94,278 @@ app.add_middleware(
 )
 
 # Directory to store uploaded files
-UPLOAD_DIR = config_mgr.get("OUTPUT", "IMAGES_PATH")
+UPLOAD_DIR = settings.output.images_path
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Keep a copy of the uploaded files on disk (detection itself works from memory)
+SAVE_UPLOADS = settings.output.save_uploads
+# Progress images are rendered in the background after the response is sent
+SAVE_IMAGES = settings.output.save_images
+region_renderer = RegionRenderer(UPLOAD_DIR, max_workers=settings.output.render_workers)
+
+# The YOLO settings in use, the class indices of their labels and the letterbox the predictor applies,
+# swapped as a whole on reload
+Detector = namedtuple("Detector", ["yolo", "label_ids", "letterbox"])
+model_registry = ModelRegistry()
+# Pin the torch threads before the first inference, split across the workers (when served by gunicorn) and predictors
+ModelRegistry.set_torch_threads(settings.server.torch_threads, settings.server.workers, settings.yolo.predictors)
+
+
+def register_detector(yolo_settings):
+    """ Load and warm the YOLO model so requests don't pay the cold start, and resolve its labels once """
+    yolo_model = model_registry.get_configured_model(yolo_settings)
+    # Minimum-padding rectangles are only used by PyTorch models, exported ones always take the full square
+    backend = yolo_model.predictor.model
+    letterbox = LetterBox(yolo_settings.imgsz, auto=backend.pt, stride=backend.stride)
+    # NMS only keeps the classes of these indices
+    return Detector(yolo_settings, resolve_label_ids(yolo_model.names, yolo_settings.labels), letterbox)
+
+
+detector = register_detector(settings.yolo)
+
+# Batch sizes run through the predictor at startup, so the first real batches don't pay first-call initialisation
+WARMUP_BATCH_SIZES = sorted({1, settings.batching.max_batch_size})
+
+
+def warmup_detector(active_detector, batch_sizes):
+    """ Run dummy batches of every size through every predictor of the pool, returns the time it took """
+    start_time = time.perf_counter()
+    imgsz = active_detector.yolo.imgsz
+    dummy_image = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+    predictor_pool = model_registry.get_predictor_pool(active_detector.yolo)
+    for batch_size in batch_sizes:
+        predictor_pool.warmup([dummy_image] * batch_size, **predict_args(active_detector))
+    return time.perf_counter() - start_time
+
+
+@app_settings.on_reload
+def reload_detector(old_settings, new_settings):
+    """ Re-register the YOLO model when its settings change, the new model is warmed before it is swapped in """
+    global detector
+    if new_settings.yolo != detector.yolo:
+        old_detector, new_detector = detector, register_detector(new_settings.yolo)
+        warmup_detector(new_detector, WARMUP_BATCH_SIZES)
+        detector = new_detector
+        # Release the previous model and its predictors, unless the new settings still use them
+        model_registry.evict(old_detector.yolo, keep=new_detector.yolo)
+        _logger.info("YOLO model re-registered with %s", new_settings.yolo)
+
+
+def letterbox_shape(image_array):
+    """ Shape the predictor letterboxes the image to, images of the same shape are batched together """
+    return detector.letterbox.padded_shape(image_array.shape[:2])
+
+
+def predict_args(active_detector):
+    """ Predictor arguments of one call """
+    yolo_settings, label_ids, _ = active_detector
+    return dict(conf=yolo_settings.confidence, classes=label_ids, device=yolo_settings.device, half=yolo_settings.half,
+                imgsz=yolo_settings.imgsz, retina_masks=app_settings.get_settings().masks.native, verbose=False)
+
+
+def predict_batch(image_arrays, active_detector=None):
+    """ Run a single YOLOv8 predictor call over a list of images, on an idle predictor of the pool (fast array path) """
+    active_detector = active_detector or detector
+    predictor_pool = model_registry.get_predictor_pool(active_detector.yolo)
+    return predictor_pool.predict_array(image_arrays, **predict_args(active_detector))
+
+
+def run_region_extraction(image_path, image_array, results, request_id, output_format=JSON_FORMAT):
+    """
+    Blocking region extraction (identification and overlap merging) for the worker pool.
+    Returns the region fields, the merged coordinates and whether the extraction succeeded.
+    """
+    region_extractor = RegionExtractor(image_path, model_registry, image_array, request_id, detector.label_ids)
+    region_fields, merged_coordinates = region_extractor.extract_regions(results, render_images=False,
+                                                                         columnar=output_format != JSON_FORMAT)
+    return region_fields, merged_coordinates, region_extractor.error is None
+
+
+# Bounded worker pool that keeps inference, rendering and downloads off the event loop
+REQUEST_TIMEOUT = settings.server.request_timeout
+QUEUE_DEPTH = settings.server.queue_depth
+worker_pool = InferenceWorkerPool(pool_size=settings.server.pool_size, queue_depth=QUEUE_DEPTH,
+                                  timeout=REQUEST_TIMEOUT, pool_type=settings.server.pool_type)
+
+# Collect concurrent requests into micro-batches for the predictor
+batch_scheduler = BatchScheduler(predict_batch, max_batch_size=settings.batching.max_batch_size,
+                                 max_wait_ms=settings.batching.max_wait_ms, worker_pool=worker_pool,
+                                 max_queue_size=QUEUE_DEPTH,
+                                 bucket_fn=letterbox_shape if settings.batching.bucket_by_shape else None,
+                                 max_concurrent_batches=settings.yolo.predictors or default_pool_size())
+
+# Batch endpoint limits: images per call and images of one call in flight at once
+BATCH_MAX_IMAGES = settings.batching.max_images_per_request
+BATCH_CONCURRENCY = settings.batching.request_concurrency
+
+# Shared keep-alive connection pool for downloading images from links
+image_fetcher = ImageFetcher(max_bytes=settings.download.max_bytes, connect_timeout=settings.download.connect_timeout,
+                             read_timeout=settings.download.read_timeout, chunk_size=settings.download.chunk_size,
+                             max_connections=settings.download.max_connections)
+
+# Concurrent requests for the same image or link wait for the one computation in flight
+single_flight = SingleFlight()
+
+# Content-addressed cache of results for images that are submitted again
+result_cache = None
+if settings.cache.enabled:
+    result_cache = ResultCache(max_entries=settings.cache.max_entries, ttl_seconds=settings.cache.ttl_seconds,
+                               disk_path=settings.cache.disk_path)
+
+
+async def run_in_pool(fn, *args):
+    """ Run a blocking call on the worker pool, turning saturation and timeouts into HTTP errors """
+    try:
+        return await worker_pool.run(fn, *args)
+    except PoolSaturatedError:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Server is busy, please retry later.", headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request timed out.")
+
+
+async def predict_in_batch(image_array):
+    """ Queue the image on the batch scheduler, turning a full queue and timeouts into HTTP errors """
+    try:
+        return await asyncio.wait_for(batch_scheduler.submit(image_array), REQUEST_TIMEOUT)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Server is busy, please retry later.", headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Request timed out.")
+
+
+async def share_in_flight(key, timer, coroutine_fn, *args):
+    """ Run the computation once for concurrent identical requests, the duplicates time their wait as 'shared' """
+    if key in single_flight:
+        with timer.stage("shared"):
+            return await single_flight.run(key, coroutine_fn, *args)
+    return await single_flight.run(key, coroutine_fn, *args)
+
+
+def result_settings(output_format=JSON_FORMAT):
+    """ Everything besides the image that its result depends on: (model, confidence, labels, variant) """
+    # Row and columnar results, results of other merge settings and results with masks are cached separately
+    current_settings = app_settings.get_settings()
+    yolo_settings, merge_settings, mask_settings = detector.yolo, current_settings.merge, current_settings.masks
+    variant = "rows" if output_format == JSON_FORMAT else "columns"
+    variant += f"|merge={merge_settings.metric},{merge_settings.threshold}"
+    if mask_settings.enabled:
+        variant += f"|masks={mask_settings.format},{mask_settings.resolution},{mask_settings.native}"
+    return yolo_settings.model, yolo_settings.confidence, tuple(yolo_settings.labels), variant
+
+
+async def extract_regions_cached(image_path, image_bytes, timer, background_tasks, output_format=JSON_FORMAT):
+    """
+    Decode, detect and merge regions for the image, reusing the cached result of identical content.
+    Concurrent requests for identical content share one detection (rendered under the first request id).
+    """
+    cache_key = ResultCache.make_key(image_bytes, *result_settings(output_format))
+    if result_cache is not None:
+        with timer.stage("cache_lookup"):
+            cached = await result_cache.lookup(cache_key)
+        if cached is not None:
+            return cached[0], cached[1], cache_key
+
+    region_fields, merged_coordinates = await share_in_flight(cache_key, timer, detect_regions, image_path,
+                                                              image_bytes, cache_key, timer, background_tasks,
+                                                              output_format)
+    return region_fields, merged_coordinates, cache_key
+
+
+async def detect_regions(image_path, image_bytes, cache_key, timer, background_tasks, output_format=JSON_FORMAT):
+    """ Decode, detect and merge regions for the image and cache the result """
+    # Decode the Image file once in memory
+    with timer.stage("decode"):
+        image_array = await run_in_pool(decode_image_bytes, image_bytes)
+    if image_array is None:
+        raise HTTPException(status_code=400, detail="Unable to decode the image file.")
+
+    # Optionally keep the Image file on disk
+    if SAVE_UPLOADS:
+        with timer.stage("save_upload"):
+            await run_in_pool(save_image_bytes, image_bytes, image_path)
+
+    # Perform Region detection on the image
+    with timer.stage("predict"):
+        results = await predict_in_batch(image_array)
+    metrics.observe_predictor_speed(results)
+    with timer.stage("extract"):
+        region_fields, merged_coordinates, extracted = await run_in_pool(run_region_extraction, image_path,
+                                                                         image_array, results, timer.request_id,
+                                                                         output_format)
+    if SAVE_IMAGES and region_count(region_fields):
+        background_tasks.add_task(region_renderer.render, timer.request_id, image_array, region_fields,
+                                  merged_coordinates)
+    # A failed extraction returns empty regions, which must not be served from the cache
+    if result_cache is not None and extracted:
+        result_cache.put(cache_key, (region_fields, merged_coordinates))
+    return region_fields, merged_coordinates
+
+
+async def extract_link_regions(image_link, timer, background_tasks, output_format=JSON_FORMAT):
+    """ Detect the regions of the image link, concurrent requests for the same link share one download """
+    return await share_in_flight(("url", image_link, output_format), timer, download_link_regions, image_link,
+                                 timer, background_tasks, output_format)
+
+
+async def download_link_regions(image_link, timer, background_tasks, output_format=JSON_FORMAT):
+    """ Download the image link and detect its regions, revalidating links that were processed before """
+    # Revalidate a previously downloaded link so an unchanged image is neither downloaded nor processed.
+    # The validators point to the cache key of the result under the current settings, so they are kept per settings
+    validator_key = (image_link, *result_settings(output_format))
+    validators = result_cache.get_url_validators(validator_key) if result_cache is not None else None
+    try:
+        with timer.stage("download"):
+            if validators is not None:
+                fetched = await image_fetcher.fetch(image_link, etag=validators[0], last_modified=validators[1])
+                if fetched.not_modified:
+                    cached = await result_cache.lookup(validators[2])
+                    if cached is not None:
+                        return cached
+                    # The result has been evicted, so download the image again
+                    fetched = await image_fetcher.fetch(image_link)
+            else:
+                fetched = await image_fetcher.fetch(image_link)
+    except ImageFetchError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    # Keep the downloaded Image file under a unique name per request
+    image_path = os.path.join(UPLOAD_DIR, f"input_{uuid.uuid4().hex}.jpg") if SAVE_UPLOADS else image_link
+    region_fields, merged_coordinates, cache_key = await extract_regions_cached(image_path, fetched.content, timer,
+                                                                                background_tasks, output_format)
+    if result_cache is not None:
+        result_cache.put_url_validators(validator_key, fetched.etag, fetched.last_modified, cache_key)
+    return region_fields, merged_coordinates
+
+
+def finish_request(timer, endpoint):
+    """ Log the stage timings of a request and record them, with its total duration, in the metrics """
+    timer.log(_logger)
+    metrics.observe_stages(timer.stages)
+    metrics.REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - timer.start_time)
+
+
+def region_response(region_fields, merged_coordinates, request_id, output_format=JSON_FORMAT):
+    """ Build the success response with region data, encoded in the negotiated format """
+    message = "Region Data found Successfully" if region_count(region_fields) else "No Region data Found"
+    response, media_type = response_class(output_format)
+    return response(content={"status": "success", "status_code": status.HTTP_200_OK,
+                             "region_data": region_fields, "message": message,
+                             "merged_coordinates": merged_coordinates},
+                    status_code=status.HTTP_200_OK, media_type=media_type, headers={"X-Request-ID": request_id})
 
 
 @app.post("/detect_regions_from_uploaded_image/")
-async def detect_regions_from_uploaded_image(image_file: UploadFile = File(...)):
+async def detect_regions_from_uploaded_image(background_tasks: BackgroundTasks, image_file: UploadFile = File(...),
+                                             accept: Optional[str] = Header(None)):
     """
     Endpoint Description:
     - Endpoint for multi-object region detection from a User-uploaded image file.
 
     Parameters:
     - image_file: User-uploaded image file.
+    - accept: `application/vnd.region-columnar+json` or `application/x-msgpack` return the regions as
+      parallel arrays (JSON or MessagePack) instead of one object per region.
 
     Returns:
     - JSONResponse with region data.
@@ -57,48 +376,46 @@ async def detect_regions_from_uploaded_image(image_file: UploadFile = File(...))
             raise HTTPException(status_code=400, detail="Invalid image file.")
 
         # Validate content type to ensure it's an image
-        if not image_file.content_type.startswith("image/"):
+        if not (image_file.content_type or "").startswith("image/"):
             raise HTTPException(status_code=400, detail="Only image files are allowed.")
 
-        # Save the Uploaded Image file from Users
-        image_path = os.path.join(UPLOAD_DIR, image_file.filename)
-        save_uploaded_file(image_file, image_path)
-
         # Perform Region detection on the uploaded image
-        region_fields, merged_coordinates = RegionExtractor(image_path).extract_regions()
-        if region_fields:
-            # Return the result as JSON response
-            return JSONResponse(content={"status": "success", "status_code": status.HTTP_200_OK,
-                                         "region_data": region_fields, "message": "Region Data found Successfully",
-                                         "merged_coordinates": merged_coordinates},
-                                status_code=status.HTTP_200_OK)
-        else:
-            # Return the result as JSON response
-            return JSONResponse(content={"status": "success", "status_code": status.HTTP_200_OK,
-                                         "region_data": region_fields, "message": "No Region data Found",
-                                         "merged_coordinates": merged_coordinates},
-                                status_code=status.HTTP_200_OK)
+        image_bytes = await image_file.read()
+        image_path = os.path.join(UPLOAD_DIR, image_file.filename)
+        request_id = uuid.uuid4().hex
+        util.set_request_id(request_id)
+        timer = util.StageTimer(request_id)
+        output_format = negotiate_format(accept)
+        region_fields, merged_coordinates, _ = await extract_regions_cached(image_path, image_bytes, timer,
+                                                                            background_tasks, output_format)
+        with timer.stage("serialize"):
+            response = region_response(region_fields, merged_coordinates, request_id, output_format)
+        finish_request(timer, "uploaded_image")
+        return response
 
     except HTTPException as e:
         # Handle client errors and return an error response
-        return JSONResponse(content={"status": "error", "status_code": e.status_code, "region_data": {},
-                                     "message": str(e.detail)}, status_code=e.status_code)
+        return ORJSONResponse(content={"status": "error", "status_code": e.status_code, "region_data": {},
+                                       "message": str(e.detail)}, status_code=e.status_code, headers=e.headers)
 
     except Exception as e:
         # Handle server errors and return an error response
-        return JSONResponse(content={"status": "error", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
-                                     "region_data": {}, "message": f"Internal server error: {str(e)}"},
-                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return ORJSONResponse(content={"status": "error", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                                       "region_data": {}, "message": f"Internal server error: {str(e)}"},
+                              status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     
 @app.post("/detect_regions_from_image_link/")
-async def detect_regions_from_image_link(doc_file_name: str):
+async def detect_regions_from_image_link(background_tasks: BackgroundTasks, doc_file_name: str,
+                                         accept: Optional[str] = Header(None)):
     """
     Endpoint Description:
     - Endpoint to detect regions from an image link on the server.
 
     Parameters:
     - image_link: URL of the image file on the server.
+    - accept: `application/vnd.region-columnar+json` or `application/x-msgpack` return the regions as
+      parallel arrays (JSON or MessagePack) instead of one object per region.
 
     Returns:
     - JSONResponse with region data.
@@ -107,34 +424,150 @@ async def detect_regions_from_image_link(doc_file_name: str):
         # Validate the input parameter
         if not doc_file_name:
             raise HTTPException(status_code=400, detail="Invalid document file name.")
-        # Save the Uploaded server Image file from Users in Local
-        image_path = save_image_from_server(doc_file_name, UPLOAD_DIR)
         # Perform Region Detection
-        region_fields, merged_coordinates = RegionExtractor(image_path).extract_regions()
-        if region_fields:
-            # Return the result as JSON response
-            return JSONResponse(content={"status": "success", "status_code": status.HTTP_200_OK,
-                                         "region_data": region_fields, "message": "Region Data found Successfully",
-                                         "merged_coordinates": merged_coordinates},
-                                status_code=status.HTTP_200_OK)
-        else:
-            # Return the result as JSON response
-            return JSONResponse(content={"status": "success", "status_code": status.HTTP_200_OK,
-                                         "region_data": region_fields, "message": "No Region data Found",
-                                         "merged_coordinates": merged_coordinates},
-                                status_code=status.HTTP_200_OK)
+        request_id = uuid.uuid4().hex
+        util.set_request_id(request_id)
+        timer = util.StageTimer(request_id)
+        output_format = negotiate_format(accept)
+        region_fields, merged_coordinates = await extract_link_regions(doc_file_name, timer, background_tasks,
+                                                                       output_format)
+        with timer.stage("serialize"):
+            response = region_response(region_fields, merged_coordinates, request_id, output_format)
+        finish_request(timer, "image_link")
+        return response
+
+    except HTTPException as e:
+        # Handle client errors and return an error response
+        return ORJSONResponse(content={"status": "error", "status_code": e.status_code, "region_data": {},
+                                       "message": str(e.detail)}, status_code=e.status_code, headers=e.headers)
 
     except Exception as e:
         # Handle Unexpected errors and return an error response
-        return JSONResponse(content={"status": "error", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
-                                     "message": f"Internal server error: {str(e)}"},
-                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return ORJSONResponse(content={"status": "error", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                                       "message": f"Internal server error: {str(e)}"},
+                              status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@app.post("/detect_regions_batch/")
+async def detect_regions_batch(background_tasks: BackgroundTasks, image_files: List[UploadFile] = File(None),
+                               image_links: List[str] = Form(None)):
+    """
+    Endpoint Description:
+    - Endpoint for region detection on many images in one call. The images are decoded concurrently
+      and go through the YOLOv8 predictor in batches.
+
+    Parameters:
+    - image_files: User-uploaded image files.
+    - image_links: URLs of image files on the server.
+
+    Returns:
+    - StreamingResponse of NDJSON, one line per image as soon as it is finished (in completion order,
+      use `index` to match the inputs).
+    """
+    try:
+        image_files, image_links = image_files or [], image_links or []
+        # Validate the input parameters
+        if not image_files and not image_links:
+            raise HTTPException(status_code=400, detail="No image files or image links given.")
+        if len(image_files) + len(image_links) > BATCH_MAX_IMAGES:
+            raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IMAGES} images are allowed per batch.")
+        for image_file in image_files:
+            if not (image_file.content_type or "").startswith("image/"):
+                raise HTTPException(status_code=400, detail=f"Only image files are allowed: {image_file.filename}")
+
+        # Read the uploads before streaming, the files are closed once the endpoint returns
+        batch_id = uuid.uuid4().hex
+        sources = [(image_file.filename, await image_file.read(), None) for image_file in image_files]
+        sources += [(image_link, None, image_link) for image_link in image_links]
+
+    except HTTPException as e:
+        # Handle client errors and return an error response
+        return ORJSONResponse(content={"status": "error", "status_code": e.status_code, "region_data": {},
+                                       "message": str(e.detail)}, status_code=e.status_code, headers=e.headers)
+
+    except Exception as e:
+        # Handle server errors before streaming starts and return an error response
+        return ORJSONResponse(content={"status": "error", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                                       "region_data": {}, "message": f"Internal server error: {str(e)}"},
+                              status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    # Limit how many images of one batch are in flight so a large batch can't saturate the worker pool
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def detect_one(index, source, image_bytes, image_link):
+        """ Detect the regions of one image of the batch and build its NDJSON record """
+        request_id = f"{batch_id}_{index}"
+        util.set_request_id(request_id)
+        timer = util.StageTimer(request_id)
+        async with semaphore:
+            try:
+                if image_link is not None:
+                    region_fields, merged_coordinates = await extract_link_regions(image_link, timer,
+                                                                                   background_tasks)
+                else:
+                    image_path = os.path.join(UPLOAD_DIR, f"{request_id}_{os.path.basename(source)}")
+                    region_fields, merged_coordinates, _ = await extract_regions_cached(image_path, image_bytes,
+                                                                                        timer, background_tasks)
+                finish_request(timer, "batch")
+                message = "Region Data found Successfully" if region_fields else "No Region data Found"
+                record = {"status": "success", "status_code": status.HTTP_200_OK, "region_data": region_fields,
+                          "message": message, "merged_coordinates": merged_coordinates}
+            except HTTPException as e:
+                record = {"status": "error", "status_code": e.status_code, "region_data": {}, "message": str(e.detail)}
+            except Exception as e:
+                record = {"status": "error", "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "region_data": {},
+                          "message": f"Internal server error: {str(e)}"}
+        return {"index": index, "source": source, "request_id": request_id, **record}
+
+    async def stream_records():
+        """ Yield one NDJSON line per image as each one finishes """
+        tasks = [asyncio.ensure_future(detect_one(index, *source)) for index, source in enumerate(sources)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield orjson.dumps(await finished) + b"\n"
+        finally:
+            # Stop the remaining work if the client goes away
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream_records(), media_type="application/x-ndjson",
+                             headers={"X-Request-ID": batch_id}, background=background_tasks)
+
+
+@app.get("/health")
+async def health():
+    """
+    Endpoint Description:
+    - Liveness probe, answers as long as the server process is running.
+    """
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """
+    Endpoint Description:
+    - Readiness probe, answers 200 once the model is loaded and warmed and 503 before that or while shutting down.
+    """
+    if not app.state.ready:
+        return ORJSONResponse(content={"status": "starting"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return {"status": "ready", "model": detector.yolo.model}
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """
+    Endpoint Description:
+    - Prometheus metrics: per-stage latency histograms (download, decode, predict, preprocess, inference,
+      postprocess, merge, render, serialize ...), request latency, batch sizes, queue depth, cache lookups
+      and model loads.
+    """
+    metrics.QUEUE_DEPTH.labels("batch").set(batch_scheduler.queue_size)
+    metrics.QUEUE_DEPTH.labels("pool").set(worker_pool.pending)
+    content, media_type = metrics.render_metrics()
+    return Response(content=content, media_type=media_type)
 
 
 if __name__ == "__main__":
-    # Get the port number from the configuration file
-    port = config_mgr.getint("SERVER_CONFIG", "PORT")
-    # Get the Host number from the configuration file
-    host = config_mgr.get("SERVER_CONFIG", "HOST")
-    # Run the application using Uvicorn
-    uvicorn.run(app, host=host, port=port)
+    # Run the application using Uvicorn on the configured host and port
+    uvicorn.run(app, host=settings.server.host, port=settings.server.port)
@@ -0,0 +1,64 @@
+"""==========================================
+ Title:  Python Assignment
+ Author: Hussain Masthan
+ Date:   Jan - 2023
+=========================================="""
+
+# Production serving: gunicorn -c gunicorn.conf.py app:app
+import gc
+import os
+import tempfile
+
+from src.utils_files.settings import get_settings, reload_settings
+
+settings = get_settings()
+
+# Workers write their metrics to a shared directory so /metrics reports all of them, whichever worker answers.
+# Must be set before prometheus_client is imported by the app.
+if settings.server.workers > 1:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="region_metrics_"))
+
+bind = f"{settings.server.host}:{settings.server.port}"
+workers = max(1, settings.server.workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(settings.server.request_timeout) * 2
+graceful_timeout = int(settings.server.request_timeout)
+
+# On CPU the app (and the warmed YOLO model) is loaded once in the master and forked into the workers,
+# which share the weights. CUDA can't be used across a fork, so GPU workers load their own model.
+preload_app = settings.yolo.device == "cpu"
+
+
+def when_ready(server):
+    """ Move the preloaded weights to shared memory and freeze the heap before the workers are forked """
+    if preload_app:
+        from app import model_registry
+        model_registry.share_memory()
+        # Objects created so far are never collected, so the GC doesn't dirty the shared pages in the workers
+        gc.freeze()
+
+
+def on_reload(server):
+    """
+    SIGHUP to the master re-forks the workers. A preloaded app is not imported again, so reload the settings
+    (and with them the model) in the master first, otherwise the new workers inherit the old ones.
+    """
+    if preload_app:
+        from app import model_registry
+        reload_settings()
+        model_registry.share_memory()
+        gc.freeze()
+
+
+def child_exit(server, worker):
+    """ Drop the live gauges of a worker that has exited """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_fork(server, worker):
+    """ Pin the torch threads of the new worker so the workers and their predictors don't oversubscribe the cores """
+    from service.region_detection_service.model_registry import ModelRegistry
+    current_settings = get_settings()
+    ModelRegistry.set_torch_threads(current_settings.server.torch_threads, workers, current_settings.yolo.predictors)
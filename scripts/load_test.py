@@ -0,0 +1,92 @@
+"""==========================================
+ Title:  Python Assignment
+ Author: Hussain Masthan
+ Date:   Jan - 2023
+=========================================="""
+
+# Load test for the region detection API, used to compare the single-process and multi-worker modes:
+#
+#   python app.py                                   # single process
+#   python scripts/load_test.py --image sample.jpg --concurrency 16 --requests 500
+#
+#   gunicorn -c gunicorn.conf.py app:app            # WORKERS worker processes
+#   python scripts/load_test.py --image sample.jpg --concurrency 16 --requests 500
+#
+# The result cache and single-flight would answer every repeat of the same upload without running inference,
+# so by default each request appends a unique suffix after the end of the image data: the bytes (and their cache key)
+# differ while the decoded image stays the same. --repeat-image sends identical bytes to measure the cache hit path.
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+
+def unique_upload(image_bytes, index):
+    """ The image with a per-request suffix after its data, decoders ignore it but the content hash changes """
+    return image_bytes + f"load-test-{index}-{time.time_ns()}".encode()
+
+
+async def run_load_test(url, image_path, concurrency, total_requests, timeout, repeat_image=False):
+    """
+    Uploads the image `total_requests` times with `concurrency` requests in flight, returns the stats.
+    Unless `repeat_image` is set every upload is made unique, so no request is a cache or single-flight hit.
+    """
+    with open(image_path, "rb") as image_file:
+        image_bytes = image_file.read()
+    file_name = os.path.basename(image_path)
+    latencies, status_codes = [], {}
+    remaining = iter(range(total_requests))
+
+    async def client_loop(client):
+        for index in remaining:
+            upload_bytes = image_bytes if repeat_image else unique_upload(image_bytes, index)
+            start_time = time.perf_counter()
+            try:
+                response = await client.post(url, files={"image_file": (file_name, upload_bytes, "image/jpeg")})
+                status_code = response.status_code
+            except httpx.HTTPError as e:
+                status_code = type(e).__name__
+            latencies.append(time.perf_counter() - start_time)
+            status_codes[status_code] = status_codes.get(status_code, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        start_time = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start_time
+
+    latencies.sort()
+    return {"requests": len(latencies), "elapsed_s": elapsed, "throughput_rps": len(latencies) / elapsed,
+            "p50_ms": 1000 * statistics.median(latencies),
+            "p95_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+            "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+            "status_codes": status_codes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the region detection API. Every upload gets a unique "
+                                                 "suffix after the image data, so the result cache and single-flight "
+                                                 "can't answer it and each request runs inference.")
+    parser.add_argument("--url", default="http://localhost:8080/detect_regions_from_uploaded_image/")
+    parser.add_argument("--image", required=True, help="Image file uploaded by every request")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--requests", type=int, default=200, help="Total number of requests")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--repeat-image", action="store_true",
+                        help="Upload identical bytes every time, which measures cache and single-flight hits "
+                             "instead of inference")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load_test(args.url, args.image, args.concurrency, args.requests, args.timeout,
+                                      args.repeat_image))
+    print(f"Requests:    {stats['requests']} in {stats['elapsed_s']:.2f}s")
+    print(f"Throughput:  {stats['throughput_rps']:.2f} req/s")
+    print(f"Latency:     p50 {stats['p50_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms, p99 {stats['p99_ms']:.1f}ms")
+    print(f"Status:      {stats['status_codes']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+import logging
+
+from service.region_detection_service.metrics import BATCH_SIZE, QUEUE_DEPTH
+
+_logger = logging.getLogger(__name__)
+
+
+class BatchScheduler:
+    """
+    Dynamic micro-batching queue in front of the YOLOv8 predictor.
+
+    Images submitted by concurrent requests within a short window are collected into one list
+    and sent through a single predictor call, then the per-image Results are handed back to the
+    waiting requests. With a `bucket_fn`, the collected images are first grouped by its key
+    (e.g. their letterboxed shape) and every group goes through its own predictor call.
+    Up to `max_concurrent_batches` predictor calls run at the same time (one per predictor of the pool).
+    """
+
+    def __init__(self, predict_fn, max_batch_size=8, max_wait_ms=10, worker_pool=None, max_queue_size=0,
+                 bucket_fn=None, max_concurrent_batches=1):
+        # predict_fn takes a list of image arrays and returns one Results per image, in order
+        self.predict_fn = predict_fn
+        # bucket_fn maps an image array to a hashable key, images with the same key are predicted together
+        self.bucket_fn = bucket_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000
+        # InferenceWorkerPool the predictor calls run on, so they count towards its pending calls
+        self.worker_pool = worker_pool
+        # 0 means unbounded, otherwise submit() fails fast with asyncio.QueueFull
+        self.max_queue_size = max(0, max_queue_size)
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self._queue = None
+        self._worker = None
+        # Free predictor call slots and the predictor calls in flight
+        self._slots = None
+        self._dispatches = set()
+
+    @property
+    def queue_size(self):
+        """Number of images waiting for the next batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        """Starts the background task that drains the queue."""
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._worker = asyncio.create_task(self.__run())
+
+    async def stop(self):
+        """Stops the background task, letting the batches in flight finish and failing any request still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Batch scheduler has been stopped."))
+
+    async def submit(self, image_array):
+        """Queues one image and waits for its Results. Raises asyncio.QueueFull when the queue is full."""
+        if self._worker is None:
+            raise RuntimeError("Batch scheduler is not running.")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((image_array, future))
+        QUEUE_DEPTH.labels("batch").set(self._queue.qsize())
+        return await future
+
+    async def __run(self):
+        """Collects a batch until it is full or the wait window is over, then dispatches it without waiting for it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Collect the next batch only once a predictor call slot is free, so it keeps filling up meanwhile
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            buckets, dispatched = [batch], 0
+            try:
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                QUEUE_DEPTH.labels("batch").set(self._queue.qsize())
+                buckets = self.__buckets(batch)
+                for bucket in buckets:
+                    if dispatched > 0:
+                        await self._slots.acquire()
+                    dispatch = asyncio.create_task(self.__dispatch(bucket))
+                    self._dispatches.add(dispatch)
+                    dispatch.add_done_callback(self.__dispatched)
+                    dispatched += 1
+            except asyncio.CancelledError:
+                # Stopped while collecting, the requests of the images not dispatched yet are failed
+                for _, future in (item for bucket in buckets[dispatched:] for item in bucket):
+                    if not future.done():
+                        future.set_exception(RuntimeError("Batch scheduler has been stopped."))
+                raise
+
+    def __dispatched(self, dispatch):
+        """Frees the predictor call slot of a finished dispatch."""
+        self._dispatches.discard(dispatch)
+        self._slots.release()
+
+    def __buckets(self, batch):
+        """Splits the batch into the groups of images that share a bucket key, in order of arrival."""
+        if self.bucket_fn is None:
+            return [batch]
+        buckets = {}
+        for item in batch:
+            buckets.setdefault(self.bucket_fn(item[0]), []).append(item)
+        return list(buckets.values())
+
+    async def __dispatch(self, batch):
+        """Runs one predictor call for the whole batch and fans the Results back out."""
+        BATCH_SIZE.observe(len(batch))
+        image_arrays = [image_array for image_array, _ in batch]
+        try:
+            if self.worker_pool is not None:
+                results = await self.worker_pool.submit(self.predict_fn, image_arrays)
+            else:
+                results = await asyncio.get_running_loop().run_in_executor(None, self.predict_fn, image_arrays)
+            if len(results) != len(batch):
+                raise RuntimeError(f"Expected {len(batch)} results from the predictor, got {len(results)}")
+        except Exception as e:
+            _logger.error(f"Batch prediction of {len(batch)} images failed! {repr(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # The request may have been cancelled (client disconnect) while the batch was running
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,146 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import numpy as np
+
+# Upper bound on candidate pairs materialised at once by the sweep, keeps memory flat on dense scenes
+_MAX_PAIRS_PER_CHUNK = 1 << 20
+
+
+def merge_overlapping_boxes(boxes, metric="intersect", threshold=0.0, until_stable=True):
+    """
+    Merges overlapping boxes into the bounding box of each connected group.
+
+    Two boxes are connected when they intersect (touching edges count, metric='intersect'), or when
+    their IoU / intersection-over-smaller-area is above `threshold` (metric='iou' / 'ioa').
+    Connectivity is transitive, so chains of overlapping boxes collapse into a single region.
+    With `until_stable`, merged boxes that grew into each other are merged again until no
+    connected pair is left.
+
+    Parameters:
+    - boxes: (n, 4) array-like of xmin, ymin, xmax, ymax.
+    - metric: 'intersect', 'iou' or 'ioa'.
+    - threshold: Minimum IoU / IoA to connect two boxes (ignored for 'intersect').
+    - until_stable: Repeat merging until the merged boxes no longer overlap.
+
+    Returns:
+    - merged_boxes: (m, 4) array of merged boxes, ordered by xmin.
+    - labels: (n,) array mapping every input box to its row in merged_boxes.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    labels = np.arange(len(boxes))
+    while len(boxes):
+        component = _connected_components(boxes, metric, threshold)
+        num_components = component.max() + 1
+        merged = np.empty((num_components, 4), dtype=np.float64)
+        merged[:, :2] = np.inf
+        merged[:, 2:] = -np.inf
+        np.minimum.at(merged[:, 0], component, boxes[:, 0])
+        np.minimum.at(merged[:, 1], component, boxes[:, 1])
+        np.maximum.at(merged[:, 2], component, boxes[:, 2])
+        np.maximum.at(merged[:, 3], component, boxes[:, 3])
+
+        # Order the merged boxes by xmin and compose the mapping from the original boxes
+        order = np.argsort(merged[:, 0], kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(num_components)
+        labels = rank[component][labels]
+        stable = num_components == len(boxes)
+        boxes = merged[order]
+        if stable or not until_stable:
+            break
+    return boxes, labels
+
+
+def _connected_components(boxes, metric, threshold):
+    """Labels the connected components of the overlap graph, numbered 0..k-1."""
+    n = len(boxes)
+    parent = np.arange(n)
+    for first, second in _overlapping_pairs(boxes, metric, threshold):
+        parent = _union(parent, first, second)
+    # Renumber the roots densely
+    _, component = np.unique(parent, return_inverse=True)
+    return component
+
+
+def _overlapping_pairs(boxes, metric, threshold):
+    """
+    Yields chunks of (i, j) index arrays of connected boxes.
+
+    Boxes are swept in xmin order: box j can only overlap box i (j after i) when xmin_j <= xmax_i,
+    so candidates come from a searchsorted range instead of the full n x n matrix.
+    """
+    n = len(boxes)
+    order = np.argsort(boxes[:, 0], kind="stable")
+    sorted_boxes = boxes[order]
+    x_min = sorted_boxes[:, 0]
+    ends = np.searchsorted(x_min, sorted_boxes[:, 2], side="right")
+    counts = np.maximum(ends - np.arange(n) - 1, 0)
+    cumulative = np.cumsum(counts)
+
+    start = 0
+    while start < n:
+        # Take as many sweep rows as fit in one chunk (at least one)
+        done = cumulative[start - 1] if start else 0
+        stop = max(int(np.searchsorted(cumulative, done + _MAX_PAIRS_PER_CHUNK, side="right")), start + 1)
+        stop = min(stop, n)
+        rows = np.arange(start, stop)
+        row_counts = counts[start:stop]
+        start = stop
+        if not row_counts.sum():
+            continue
+
+        first = np.repeat(rows, row_counts)
+        offsets = np.arange(len(first)) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+        second = first + 1 + offsets
+
+        box_i, box_j = sorted_boxes[first], sorted_boxes[second]
+        inter_w = np.minimum(box_i[:, 2], box_j[:, 2]) - np.maximum(box_i[:, 0], box_j[:, 0])
+        inter_h = np.minimum(box_i[:, 3], box_j[:, 3]) - np.maximum(box_i[:, 1], box_j[:, 1])
+        connected = (inter_w >= 0) & (inter_h >= 0)
+        if metric != "intersect":
+            inter = np.clip(inter_w, 0, None) * np.clip(inter_h, 0, None)
+            area_i = (box_i[:, 2] - box_i[:, 0]) * (box_i[:, 3] - box_i[:, 1])
+            area_j = (box_j[:, 2] - box_j[:, 0]) * (box_j[:, 3] - box_j[:, 1])
+            if metric == "iou":
+                denominator = area_i + area_j - inter
+            elif metric == "ioa":
+                denominator = np.minimum(area_i, area_j)
+            else:
+                raise ValueError(f"Unsupported overlap metric '{metric}', expected 'intersect', 'iou' or 'ioa'")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = np.where(denominator > 0, inter / denominator, 0.0)
+            connected &= ratio > threshold
+
+        if connected.any():
+            yield order[first[connected]], order[second[connected]]
+
+
+def _union(parent, first, second):
+    """
+    Vectorised union-find step: links every (first, second) pair, then compresses paths.
+
+    Each round hooks the larger root of a pair onto the smaller one and applies pointer jumping
+    until no pair spans two trees.
+    """
+    while True:
+        root_first, root_second = _find(parent, first), _find(parent, second)
+        differ = root_first != root_second
+        if not differ.any():
+            return parent
+        low = np.minimum(root_first[differ], root_second[differ])
+        high = np.maximum(root_first[differ], root_second[differ])
+        np.minimum.at(parent, high, low)
+
+
+def _find(parent, nodes):
+    """Returns the roots of the nodes, compressing the paths of the whole forest."""
+    while True:
+        grand_parent = parent[parent]
+        if np.array_equal(grand_parent, parent):
+            break
+        parent[:] = grand_parent
+    return parent[nodes]
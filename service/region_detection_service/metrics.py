@@ -0,0 +1,58 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import os
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+
+# Latency buckets (seconds) from sub-millisecond merges up to slow downloads
+_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_SECONDS = Histogram("region_stage_seconds", "Duration of one pipeline stage of a request",
+                          ["stage"], buckets=_LATENCY_BUCKETS)
+REQUEST_SECONDS = Histogram("region_request_seconds", "End-to-end duration of a request",
+                            ["endpoint"], buckets=_LATENCY_BUCKETS)
+BATCH_SIZE = Histogram("region_batch_size", "Number of images per predictor call",
+                       buckets=(1, 2, 4, 8, 16, 32, 64))
+QUEUE_DEPTH = Gauge("region_queue_depth", "Work waiting or running, per queue", ["queue"],
+                    multiprocess_mode="livesum")
+CACHE_LOOKUPS = Counter("region_cache_lookups_total", "Result cache lookups by outcome", ["result"])
+DEDUPLICATED_REQUESTS = Counter("region_deduplicated_requests_total",
+                                "Requests that shared the computation of an identical request in flight")
+MODEL_LOADS = Counter("region_model_loads_total", "YOLO model loads (including hot reloads)", ["model"])
+MODEL_LOAD_SECONDS = Histogram("region_model_load_seconds", "Duration of loading and warming a YOLO model",
+                               ["model"], buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+
+# Stages reported by the predictor in Results.speed (milliseconds per image)
+PREDICTOR_STAGES = ("preprocess", "inference", "postprocess")
+
+
+def observe_stages(stages_ms):
+    """ Records a {stage: milliseconds} mapping, e.g. StageTimer.stages or Results.speed """
+    for stage, duration_ms in stages_ms.items():
+        if duration_ms is not None:
+            STAGE_SECONDS.labels(stage).observe(duration_ms / 1E3)
+
+
+def observe_predictor_speed(results):
+    """ Records the preprocess / inference / postprocess timings the predictor attached to the Results """
+    speed = getattr(results, "speed", None) or {}
+    observe_stages({stage: speed.get(stage) for stage in PREDICTOR_STAGES})
+
+
+def render_metrics():
+    """
+    Returns the Prometheus text exposition and its content type.
+
+    With several gunicorn workers (PROMETHEUS_MULTIPROC_DIR set) the samples of all workers are aggregated.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
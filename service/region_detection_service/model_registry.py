@@ -0,0 +1,243 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import os
+import hashlib
+import logging
+import threading
+import time
+
+import numpy as np
+import torch
+import ultralytics
+
+import yolo.ultralytics
+from service.region_detection_service.metrics import MODEL_LOAD_SECONDS, MODEL_LOADS
+from yolo.ultralytics import YOLO
+from yolo.ultralytics.engine.predictor_pool import PredictorPool, default_pool_size
+
+_logger = logging.getLogger(__name__)
+
+# Inference backends and the suffix of their exported artifact ('pytorch' serves the checkpoint itself)
+EXPORT_SUFFIXES = {"onnx": ".onnx", "openvino": "_openvino_model"}
+
+# Registry of the callers that don't bring their own, created on first use
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def check_vendored_ultralytics():
+    """
+    Raises RuntimeError unless the loaded `ultralytics` package is the vendored one under yolo/.
+
+    The vendored package imports itself as `ultralytics`, so with another install (e.g. the PyPI release)
+    yolo.ultralytics.YOLO silently comes from that install, which has no predictor pool, no predict_array
+    path and rejects the runtime thread arguments.
+    """
+    loaded_dir = os.path.dirname(os.path.abspath(ultralytics.__file__))
+    vendored_dir = os.path.dirname(os.path.abspath(yolo.ultralytics.__file__))
+    if not os.path.samefile(loaded_dir, vendored_dir):
+        raise RuntimeError(f"ultralytics is loaded from {loaded_dir} instead of the vendored {vendored_dir}, "
+                           f"install it with 'pip install -e ./yolo'")
+
+
+def get_default_registry():
+    """Returns the process-wide default ModelRegistry, created on first use."""
+    global _default_registry
+    registry = _default_registry
+    if registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = ModelRegistry()
+            registry = _default_registry
+    return registry
+
+
+class ModelRegistry:
+    """Process-wide cache of loaded and warmed YOLOv8 Models and of their predictor pools."""
+
+    def __init__(self, models_dir="yolo"):
+        check_vendored_ultralytics()
+        self.models_dir = models_dir
+        # (weights_path, device, half, imgsz, backend, intra_op_threads, inter_op_threads)
+        #   -> (yolo_model, weights_mtime)
+        self._models = {}
+        # (model_name, device, half, imgsz, backend, intra_op_threads, inter_op_threads, predictors)
+        #   -> (predictor_pool, yolo_model it was created from)
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def get_model(self, model_name, device="cpu", half=False, imgsz=640, backend="pytorch", intra_op_threads=0,
+                  inter_op_threads=0):
+        """
+        Returns a warmed YOLOv8 Model for the given settings.
+
+        The model is loaded on first use and re-loaded when its weights file changes on disk,
+        so a new checkpoint can be dropped in place without restarting the server.
+        With the 'onnx' or 'openvino' backend the checkpoint is exported once and served by that runtime
+        with the given thread settings.
+        """
+        if backend != "pytorch" and backend not in EXPORT_SUFFIXES:
+            raise ValueError(f"Unsupported backend '{backend}', expected 'pytorch', 'onnx' or 'openvino'")
+        weights_path = os.path.join(self.models_dir, model_name)
+        key = (weights_path, device, half, imgsz, backend, intra_op_threads, inter_op_threads)
+        weights_mtime = self.__weights_mtime(weights_path)
+
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None and cached[1] == weights_mtime:
+                return cached[0]
+
+            if cached is not None:
+                _logger.info("Weights file %s has changed, reloading the model..." % weights_path)
+            yolo_model = self.__load_model(weights_path, device, half, imgsz, backend, intra_op_threads,
+                                           inter_op_threads)
+            # Weights may have been downloaded during the load, so re-read the modification time
+            self._models[key] = (yolo_model, self.__weights_mtime(weights_path))
+            return yolo_model
+
+    def get_configured_model(self, yolo_settings):
+        """Returns the warmed model for a [YOLO] settings section."""
+        return self.get_model(yolo_settings.model, yolo_settings.device, yolo_settings.half, yolo_settings.imgsz,
+                              yolo_settings.backend, yolo_settings.intra_op_threads, yolo_settings.inter_op_threads)
+
+    def get_predictor_pool(self, yolo_settings):
+        """
+        Returns the pool of predictors for a [YOLO] settings section, created on first use.
+
+        Its PREDICTORS predictors share the weights of the cached model and run concurrent batches
+        in parallel. The pool is re-created when the model itself is reloaded.
+        """
+        yolo_model = self.get_configured_model(yolo_settings)
+        key = self.__pool_key(yolo_settings)
+        with self._lock:
+            cached = self._pools.get(key)
+            if cached is not None and cached[1] is yolo_model:
+                return cached[0]
+
+            predictor_pool = PredictorPool(yolo_model, size=yolo_settings.predictors, device=yolo_settings.device,
+                                           half=yolo_settings.half, imgsz=yolo_settings.imgsz, verbose=False,
+                                           intra_op_threads=yolo_settings.intra_op_threads,
+                                           inter_op_threads=yolo_settings.inter_op_threads)
+            self._pools[key] = (predictor_pool, yolo_model)
+            _logger.info("Predictor pool of %d created for %s" % (predictor_pool.size, yolo_settings.model))
+            return predictor_pool
+
+    def evict(self, yolo_settings, keep=None):
+        """
+        Drops the model and predictor pool of a [YOLO] settings section, e.g. the previous one after a reload,
+        except the ones still used by the `keep` settings. Calls in flight keep the objects they already hold.
+        """
+        model_key, pool_key = self.__model_key(yolo_settings), self.__pool_key(yolo_settings)
+        if keep is not None:
+            model_key = None if model_key == self.__model_key(keep) else model_key
+            pool_key = None if pool_key == self.__pool_key(keep) else pool_key
+        with self._lock:
+            evicted = self._models.pop(model_key, None) is not None
+            evicted |= self._pools.pop(pool_key, None) is not None
+        if evicted:
+            _logger.info("Model %s evicted from the registry" % yolo_settings.model)
+
+    def clear(self):
+        """Drops every cached model and predictor pool so the next request loads them again."""
+        with self._lock:
+            self._models.clear()
+            self._pools.clear()
+
+    def share_memory(self):
+        """
+        Moves the weights of every cached CPU model into shared memory.
+
+        Called in the parent before forking the server workers: the workers then map the same
+        weight pages instead of each getting its own copy once the pages are touched.
+        """
+        with self._lock:
+            for (weights_path, device, *_), (yolo_model, _) in self._models.items():
+                if str(device) == "cpu" and isinstance(yolo_model.model, torch.nn.Module):
+                    yolo_model.model.share_memory()
+                    _logger.info("Model %s weights moved to shared memory" % weights_path)
+
+    def __model_key(self, yolo_settings):
+        """Key of the cached model of a [YOLO] settings section."""
+        return (os.path.join(self.models_dir, yolo_settings.model), yolo_settings.device, yolo_settings.half,
+                yolo_settings.imgsz, yolo_settings.backend, yolo_settings.intra_op_threads,
+                yolo_settings.inter_op_threads)
+
+    @staticmethod
+    def __pool_key(yolo_settings):
+        """Key of the cached predictor pool of a [YOLO] settings section."""
+        return (yolo_settings.model, yolo_settings.device, yolo_settings.half, yolo_settings.imgsz,
+                yolo_settings.backend, yolo_settings.intra_op_threads, yolo_settings.inter_op_threads,
+                yolo_settings.predictors)
+
+    @staticmethod
+    def set_torch_threads(num_threads=0, workers=1, predictors=1):
+        """
+        Pins the torch intra-op threads of each inference call in this process.
+
+        With several worker processes on one host, each running several predictors at once, every call
+        would otherwise start one thread per core and oversubscribe the CPU, so by default the cores are
+        split across the workers and their predictors.
+        """
+        if num_threads <= 0:
+            predictors = predictors if predictors > 0 else default_pool_size()
+            num_threads = max(1, (os.cpu_count() or 1) // (max(1, workers) * predictors))
+        torch.set_num_threads(num_threads)
+        _logger.info("Torch intra-op threads set to %d" % num_threads)
+        return num_threads
+
+    @staticmethod
+    def __load_model(weights_path, device, half, imgsz, backend="pytorch", intra_op_threads=0, inter_op_threads=0):
+        """Loads the weights and runs a dummy prediction so the predictor is set up and warmed."""
+        start_time = time.time()
+        model_path = weights_path
+        if backend != "pytorch":
+            model_path = ModelRegistry.__exported_model(weights_path, backend, imgsz)
+        yolo_model = YOLO(model_path)
+        dummy_image = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+        # The predictor is created by this first call, so the runtime thread settings only need to be passed here
+        yolo_model.predict(source=dummy_image, device=device, half=half, imgsz=imgsz, verbose=False,
+                           intra_op_threads=intra_op_threads, inter_op_threads=inter_op_threads)
+        load_time = time.time() - start_time
+        MODEL_LOADS.labels(weights_path).inc()
+        MODEL_LOAD_SECONDS.labels(weights_path).observe(load_time)
+        _logger.info("Model %s loaded with the %s backend on %s in %.3fs" % (model_path, backend, device, load_time))
+        return yolo_model
+
+    @staticmethod
+    def __exported_model(weights_path, backend, imgsz):
+        """
+        Returns the artifact exported for the backend, next to the weights.
+
+        The artifact name carries a hash of the weights and the imgsz, so it is exported once and
+        a changed checkpoint or image size gets a new export instead of a stale one.
+        """
+        if not os.path.exists(weights_path):
+            # Downloads the checkpoint
+            YOLO(weights_path)
+        sha256 = hashlib.sha256()
+        with open(weights_path, "rb") as weights_file:
+            for chunk in iter(lambda: weights_file.read(1 << 20), b""):
+                sha256.update(chunk)
+        artifact_path = f"{os.path.splitext(weights_path)[0]}_{sha256.hexdigest()[:12]}_{imgsz}" \
+                        f"{EXPORT_SUFFIXES[backend]}"
+        if os.path.exists(artifact_path):
+            return artifact_path
+
+        start_time = time.time()
+        # Dynamic axes so the exported model takes any batch size and rectangular inputs
+        exported_path = YOLO(weights_path).export(format=backend, imgsz=imgsz, dynamic=True, half=False)
+        os.replace(str(exported_path).rstrip(os.sep), artifact_path)
+        _logger.info("Model %s exported to %s in %.3fs" % (weights_path, artifact_path, time.time() - start_time))
+        return artifact_path
+
+    @staticmethod
+    def __weights_mtime(weights_path):
+        """Returns the modification time of the weights file, or None if it does not exist yet."""
+        try:
+            return os.stat(weights_path).st_mtime_ns
+        except OSError:
+            return None
@@ -5,219 +5,206 @@
 =========================================="""
 
 import os
-import datetime
 import logging
 import time
+import uuid
 
 import cv2
 import numpy as np
 
-from yolo.ultralytics import YOLO
-from src.utils_files.config_reader import ConfigReader
+from service.region_detection_service.box_merging import merge_overlapping_boxes
+from service.region_detection_service.metrics import STAGE_SECONDS
+from service.region_detection_service.model_registry import get_default_registry
+from service.region_detection_service.region_encoding import (columns_from_boxes, columns_from_coordinates,
+                                                              coordinates_from_columns, region_count,
+                                                              regions_from_columns)
+from service.region_detection_service.region_masks import encode_masks
+from service.region_detection_service.region_renderer import RegionRenderer
 from src.utils_files import util
+from src.utils_files.settings import get_settings
 
 _logger = logging.getLogger(__name__)
 
 
+def resolve_label_ids(names, labels):
+    """Returns the class indices of the model whose names are among the labels."""
+    return [class_id for class_id, class_name in names.items() if class_name in labels]
+
+
 class RegionExtractor:
     """Class for extracting regions from an image using YOLOv8 Model."""
 
-    def __init__(self, image_path):
+    def __init__(self, image_path, model_registry=None, image_array=None, request_id=None, label_ids=None):
         self.image_path = image_path
-        self.config_mgr = ConfigReader().config_reader()
-        predefined_model = self.config_mgr.get("YOLO", "MODEL")
-        self.yolo_model = YOLO(f"yolo/{predefined_model}")
-        self.save_images = self.config_mgr.get("OUTPUT", "SAVE_IMAGES")
-        self.confidence_threshold = self.config_mgr.getfloat("YOLO", "CONFIDENCE")
-        self.labels = self.config_mgr.get("YOLO", "LABELS")[1:-1].split(', ')
-        self.data_path = self.config_mgr.get("OUTPUT", "IMAGES_PATH")
-
-    def extract_regions(self):
-        """Extracts regions from the image using YOLOv8 Model."""
+        # Progress images of this request go to their own directory
+        self.request_id = request_id or uuid.uuid4().hex
+        # Decode the image only once and share the array across detection and all rendering steps
+        self.image_array = image_array if image_array is not None else cv2.imread(image_path)
+        # Settings are parsed once per process, this is only an attribute lookup
+        settings = get_settings()
+        self.device = settings.yolo.device
+        self.half = settings.yolo.half
+        self.imgsz = settings.yolo.imgsz
+        # Reuse the warmed model from the shared registry instead of loading the weights per request,
+        # only looked up when the model is needed (predictions or label ids not handed in)
+        self.model_registry = model_registry
+        self.yolo_settings = settings.yolo
+        self._yolo_model = None
+        self.save_images = settings.output.save_images
+        self.confidence_threshold = settings.yolo.confidence
+        self.labels = settings.yolo.labels
+        # Class indices of the labels, handed to NMS so other classes are dropped inside the predictor
+        self.label_ids = label_ids if label_ids is not None else resolve_label_ids(self.yolo_model.names, self.labels)
+        self.data_path = settings.output.images_path
+        self.merge_metric = settings.merge.metric
+        self.merge_threshold = settings.merge.threshold
+        # Per-region masks of a segmentation model
+        self.masks = settings.masks
+        # Last error swallowed by extract_regions, its regions are then incomplete and must not be cached
+        self.error = None
+
+    @property
+    def yolo_model(self):
+        """The warmed YOLOv8 Model of the current settings, looked up in the registry on first use."""
+        if self._yolo_model is None:
+            self.model_registry = self.model_registry or get_default_registry()
+            self._yolo_model = self.model_registry.get_configured_model(self.yolo_settings)
+        return self._yolo_model
+
+    def extract_regions(self, results=None, render_images=True, columnar=False):
+        """
+        Extracts regions from the image using YOLOv8 Model.
+
+        Parameters:
+        - results: Predictions already computed for this image (e.g. by the batch scheduler).
+          The model is only run when they are not given.
+        - render_images: Write the progress images inline when SAVE_IMAGES is enabled. The API
+          turns this off and renders them in the background after the response is sent.
+        - columnar: Return parallel arrays (xmin, ymin, ...) built straight from the Boxes tensors
+          instead of one dict per region.
+        """
         regions_list, merged_coordinates = {}, {}
+        # Tag the log records written from this (worker) thread with the request id
+        request_token = util.set_request_id(self.request_id)
         try:
-            # Log File Creation Process
-            log_file = util.setup_root_logger("Python-Assignment")
-            _logger.info("--------------------------------------------")
-            _logger.info("Log file is writing to : %s" % log_file)
-            _logger.info("--------------------------------------------")
-
             # Start time
             start_time = time.time()
-            app_name = "Assignment - Region Extraction Using YoloV8 Model"
-            _logger.info(f'{app_name} has started at {format(start_time)}')
-            _logger.info(f"Beginning {app_name} process, log is: {log_file}")
-            _logger.info("Region Extraction API post process is started...")
-            _logger.info(f"FileName: {self.image_path}")
+            _logger.info("Region Extraction process is started for FileName: %s", self.image_path)
 
             # Region identification process
-            _logger.info("Region Identification process is started...")
-            regions_list = self.__identify_regions()
-            _logger.info("Region Identification process is completed...")
-            if regions_list:
+            _logger.debug("Region Identification process is started...")
+            if columnar:
+                regions_list = self.__identify_region_columns(results)
+            else:
+                regions_list = self.__identify_regions(results)
+            _logger.debug("Region Identification process is completed...")
+            if region_count(regions_list):
                 # Coordinates overlapping process
-                _logger.info("Coordinates Overlapping process is started...")
-                merged_coordinates = self.__merge_overlapping_coordinates(regions_list)
-                _logger.info("Coordinates Overlapping process is completed...")
+                _logger.debug("Coordinates Overlapping process is started...")
+                merged_coordinates = self.__merge_overlapping_coordinates(regions_list, columnar)
+                _logger.debug("Coordinates Overlapping process is completed...")
 
                 # Logging and saving progress images
-                if self.save_images == 'True':
-                    _logger.info("Output Progress Image is started...")
-                    self.__write_bounding_box_original(regions_list)
-                    self.__write_merged_overlap_image(merged_coordinates)
-                    self.__write_white_mask_image(regions_list)
-                    self.__write_mask_image_with_original(regions_list)
-                    _logger.info("Output Progress Image is completed...")
+                if self.save_images and render_images:
+                    _logger.debug("Output Progress Image is started...")
+                    region_renderer = RegionRenderer(self.data_path)
+                    region_renderer.render(self.request_id, self.image_array, regions_list, merged_coordinates)
+                    region_renderer.shutdown()
+                    _logger.debug("Output Progress Image is completed...")
             else:
                 _logger.info("No Regions Found in this image...")
             # Logging region fields
-            _logger.info(f"Region Fields: {regions_list}")
-            _logger.info("----------------------------------")
-            _logger.info(f"Execution of {app_name} process is Successfully Completed")
-            _logger.info("----------------------------------")
-            _logger.info(f"Elapsed time: {time.time() - start_time}")
-            _logger.info(f'{app_name} has completed at {format(datetime.datetime.now())}')
-            _logger.info("----------------------------------")
+            _logger.debug("Region Fields: %s", regions_list)
+            _logger.info("Region Extraction process found %d regions, elapsed time: %.3fs",
+                         region_count(regions_list), time.time() - start_time)
 
         except Exception as e:
-            _logger.error(f"Region Extraction API failed! {repr(e)}")
+            self.error = e
+            _logger.error("Region Extraction API failed! %r", e)
+
+        finally:
+            util.reset_request_id(request_token)
 
         return regions_list, merged_coordinates
 
     # @classmethod
-    def __identify_regions(self):
+    def __identify_regions(self, results=None):
         """This is a private method intended for internal use within the class."""
         """Identifies regions in the image using YOLOv8 Model."""
         regions_list = []
 
         try:
-            # Read the image as an array
-            image_array = cv2.imread(self.image_path)
-            # Use YOLOv8 model to predict regions in the image
-            results = self.yolo_model.predict(source=image_array, save=True, save_txt=True,
-                                              conf=self.confidence_threshold)
+            results = self.__predict(results)
 
-            # Iterate through the results to extract relevant information
+            # Extract the regions of every result from its Boxes tensor in one CPU transfer
             for class_data in results:
-                for box in class_data.boxes:
-                    coordinates = box.xyxy[0].tolist()
-                    class_id = box.cls[0].item()
-                    confidence = box.conf[0].item()
-                    class_name = class_data.names[class_id]
-
-                    print("Object type:", class_id)
-                    print("Coordinates:", coordinates)
-                    print("Probability:", confidence)
-                    print("ClassNames:", class_name)
-
-                    # Check if the detected class is among the specified labels
-                    if class_name in self.labels:
-                        region_dict = {'xmin': int(coordinates[0]), 'ymin': int(coordinates[1]),
-                                       'xmax': int(coordinates[2]), 'ymax': int(coordinates[3]),
-                                       'confidence': round(confidence, 2), 'class_id': class_id,
-                                       'class_name': class_name}
-                        regions_list.append(region_dict)
-
-            _logger.info("Identify Region Process has been completed successfully...")
+                region_columns = columns_from_boxes(class_data.boxes, class_data.names, self.label_ids,
+                                                    self.__encode_masks(class_data))
+                regions_list.extend(regions_from_columns(region_columns))
+
+            _logger.debug("Identify Region Process has been completed successfully...")
 
         except Exception as e:
             # Log an error message if the region identification process fails
+            self.error = e
             _logger.error(f"Region Identification Process failed! {repr(e)}")
 
         return regions_list
 
-    def __write_bounding_box_original(self, regions_list):
-        """Writes an image with a detected region bounding boxes"""
+    def __identify_region_columns(self, results=None):
+        """Identifies regions in the image as parallel arrays, straight from the Boxes tensors."""
+        region_columns = {}
         try:
-            original_image = cv2.imread(self.image_path)
-            for reg_idx, region_data in enumerate(regions_list):
-                xMin, yMin, xMax, yMax = region_data['xmin'], region_data['ymin'], region_data['xmax'], region_data['ymax']
-                label, accuracy = region_data['class_name'], region_data['confidence']
-                text = f'{label} ({accuracy:.2f})'
-                cv2.rectangle(original_image, (xMin, yMin), (xMax, yMax), (0, 255, 0), 2)
-                cv2.putText(original_image, text, (xMin, yMin - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-            cv2.imwrite(f"{self.data_path}/original_annotated.jpg", original_image)
-        except Exception as e:
-            _logger.error(f"Region Detection Process with Original Image Process failed! {repr(e)}")
+            results = self.__predict(results)
+            region_columns = columns_from_boxes(results[0].boxes, results[0].names, self.label_ids,
+                                                self.__encode_masks(results[0]))
+            _logger.debug("Identify Region Process has been completed successfully...")
 
-    def __write_white_mask_image(self, regions_list):
-        """Writes an image with a white mask based on identified regions."""
-        try:
-            original_image = cv2.imread(self.image_path)
-            white_mask_image = np.zeros_like(original_image)
-            self.__write_images(regions_list, white_mask_image, 'white_mask')
-        except Exception as e:
-            _logger.error(f"Image Mask Creation Process failed! {repr(e)}")
-
-    def __write_mask_image_with_original(self, regions_list):
-        """Writes an image with a mask overlay on the original image."""
-        try:
-            original_image_copy = ''
-            original_image = cv2.imread(self.image_path)
-            original_image_copy = original_image.copy()
-            self.__write_images(regions_list, original_image_copy, 'white_mask_original')
         except Exception as e:
-            _logger.error(f"Image Mask Overlay Process failed! {repr(e)}")
-
-    def __write_merged_overlap_image(self, merged_coordinates_list):
-        """Writes an image with merged overlapping regions."""
-        try:
-            original_image_copy = ''
-            original_image = cv2.imread(self.image_path)
-            original_image_copy = original_image.copy()
-            self.__write_images(merged_coordinates_list, original_image_copy, 'merged_overlap')
-        except Exception as e:
-            _logger.error(f"Merged Overlapping Image Writing Process failed! {repr(e)}")
+            # Log an error message if the region identification process fails
+            self.error = e
+            _logger.error(f"Region Identification Process failed! {repr(e)}")
 
-    def __merge_overlapping_coordinates(self, regions_list):
-        """Merges overlapping coordinates in a list of regions."""
+        return region_columns
+
+    def __encode_masks(self, result):
+        """Encodes the masks of a segmentation result when masks are enabled, None otherwise."""
+        if not self.masks.enabled:
+            return None
+        return encode_masks(result, self.masks.format, self.masks.resolution)
+
+    def __predict(self, results=None):
+        """Runs the YOLOv8 model on the image, unless predictions were handed in."""
+        if results is None:
+            results = self.yolo_model.predict(source=self.image_array, save=True, save_txt=True,
+                                              conf=self.confidence_threshold, classes=self.label_ids,
+                                              retina_masks=self.masks.native,
+                                              device=self.device, half=self.half, imgsz=self.imgsz)
+        elif not isinstance(results, list):
+            results = [results]
+        return results
+
+    def __merge_overlapping_coordinates(self, regions_list, columnar=False):
+        """Merges overlapping coordinates in a list (or columns) of regions."""
         merged_boxes = []
         try:
-            # Convert regions to a list of tuples for easy manipulation
-            coordinates_tuples = [(region['xmin'], region['ymin'],
-                                   region['xmax'], region['ymax']) for region in regions_list]
-
-            # Sort bounding boxes based on Xmin
-            sorted_boxes = sorted(coordinates_tuples, key=lambda box: box[0])
-            merged_boxes = []
-            current_box = sorted_boxes[0]
-
-            for next_box in sorted_boxes[1:]:
-                # Check if the boxes overlap
-                if current_box[0] + current_box[2] >= next_box[0]:
-                    # Merge overlapping boxes
-                    current_box = (
-                        min(current_box[0], next_box[0]),
-                        min(current_box[1], next_box[1]),
-                        max(current_box[2], next_box[2]),
-                        max(current_box[3], next_box[3])
-                    )
-                else:
-                    # No overlap, add the current merged box to the result
-                    if current_box:
-                        merged_boxes.append({'xmin': current_box[0], 'ymin': current_box[1],
-                                            'xmax': current_box[2], 'ymax': current_box[3]})
-                        current_box = next_box
-
-            # Add the last merged box
-            if current_box:
-                merged_boxes.append({'xmin': current_box[0], 'ymin': current_box[1],
-                                    'xmax': current_box[2], 'ymax': current_box[3]})
+            # Convert regions to an (n, 4) array and merge the connected groups of overlapping boxes
+            if columnar:
+                coordinates = coordinates_from_columns(regions_list)
+            else:
+                coordinates = np.array([(region['xmin'], region['ymin'], region['xmax'], region['ymax'])
+                                        for region in regions_list])
+            with STAGE_SECONDS.labels("merge").time():
+                merged_coordinates, _ = merge_overlapping_boxes(coordinates, metric=self.merge_metric,
+                                                                threshold=self.merge_threshold)
+            if columnar:
+                merged_boxes = columns_from_coordinates(merged_coordinates)
+            else:
+                merged_boxes = [{'xmin': int(x_min), 'ymin': int(y_min), 'xmax': int(x_max), 'ymax': int(y_max)}
+                                for x_min, y_min, x_max, y_max in merged_coordinates.tolist()]
 
         except Exception as e:
+            self.error = e
             _logger.error(f"Merged Overlapping Coordinates Process failed! {repr(e)}")
 
         return merged_boxes
-
-    def __write_images(self, coordinates_list, image_data, image_name):
-        """Writes images with specified names and overlays."""
-        try:
-            for idx, region in enumerate(coordinates_list):
-                x_min, y_min = region['xmin'], region['ymin']
-                x_max, y_max = region['xmax'], region['ymax']
-                cv2.rectangle(image_data, (x_min, y_min), (x_max, y_max), (255, 255, 255), thickness=cv2.FILLED)
-                # image_data[yMin:yMax, xMin:xMax, :] = (255, 255, 255)
-            if self.save_images == "True":
-                cv2.imwrite(f"{self.data_path}/{image_name}.jpg", image_data)
-        except Exception as e:
-            _logger.error(f"Image Writing Process failed! {repr(e)}")
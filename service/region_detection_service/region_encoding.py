@@ -0,0 +1,119 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import msgpack
+import numpy as np
+from fastapi.responses import ORJSONResponse, Response
+
+# Output formats negotiated from the Accept header
+JSON_FORMAT = "json"
+COLUMNAR_FORMAT = "columnar"
+MSGPACK_FORMAT = "msgpack"
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.region-columnar+json"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+REGION_FIELDS = ("xmin", "ymin", "xmax", "ymax", "confidence", "class_id", "class_name")
+COORDINATE_FIELDS = ("xmin", "ymin", "xmax", "ymax")
+
+
+class MsgPackResponse(Response):
+    """ Response rendering the content with MessagePack """
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content):
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def negotiate_format(accept_header):
+    """
+    Pick the output format from the Accept header.
+
+    - application/x-msgpack: columnar arrays encoded with MessagePack.
+    - application/vnd.region-columnar+json: columnar arrays as JSON.
+    - anything else: one JSON object per region (the default).
+    """
+    accept_header = (accept_header or "").lower()
+    if MSGPACK_MEDIA_TYPE in accept_header:
+        return MSGPACK_FORMAT
+    if COLUMNAR_MEDIA_TYPE in accept_header:
+        return COLUMNAR_FORMAT
+    return JSON_FORMAT
+
+
+def response_class(output_format):
+    """Returns the response class and media type for the output format."""
+    if output_format == MSGPACK_FORMAT:
+        return MsgPackResponse, MSGPACK_MEDIA_TYPE
+    if output_format == COLUMNAR_FORMAT:
+        return ORJSONResponse, COLUMNAR_MEDIA_TYPE
+    return ORJSONResponse, "application/json"
+
+
+def columns_from_boxes(boxes, names, class_ids=None, masks=None):
+    """
+    Builds parallel region arrays straight from an ultralytics Boxes object.
+
+    The whole (n, 6) Boxes.data tensor is moved to the CPU in one transfer and sliced into columns,
+    so no per-box tensor access or dict is needed.
+
+    Parameters:
+    - boxes: ultralytics.engine.results.Boxes of one image.
+    - names: Class id to class name mapping of the model.
+    - class_ids: Class ids to keep, or None to keep every class.
+    - masks: Encoded masks aligned with the boxes (see region_masks.encode_masks), added as a 'mask' column.
+    """
+    data = boxes.data.cpu().numpy()
+    class_column = data[:, -1].astype(np.int64)
+    if class_ids is not None:
+        keep = np.isin(class_column, np.asarray(list(class_ids), dtype=np.int64))
+        data, class_column = data[keep], class_column[keep]
+        if masks is not None:
+            masks = [mask for mask, kept in zip(masks, keep) if kept]
+    xyxy = data[:, :4].astype(np.int64)
+    class_names = np.asarray([names[class_id] for class_id in range(len(names))], dtype=object)
+    columns = {"xmin": xyxy[:, 0].tolist(), "ymin": xyxy[:, 1].tolist(),
+               "xmax": xyxy[:, 2].tolist(), "ymax": xyxy[:, 3].tolist(),
+               # Rounded in float64, float32 0.83 would serialize as 0.8299999833106995.
+               # Class ids stay floats like Boxes.cls
+               "confidence": np.round(data[:, 4].astype(np.float64), 2).tolist(),
+               "class_id": class_column.astype(np.float64).tolist(),
+               "class_name": class_names[class_column].tolist()}
+    if masks is not None:
+        columns["mask"] = list(masks)
+    return columns
+
+
+def columns_from_coordinates(coordinates):
+    """Builds xmin/ymin/xmax/ymax arrays from an (n, 4) coordinates array."""
+    coordinates = np.asarray(coordinates).reshape(-1, 4).astype(np.int64)
+    return {field: coordinates[:, idx].tolist() for idx, field in enumerate(COORDINATE_FIELDS)}
+
+
+def coordinates_from_columns(columns):
+    """Returns the (n, 4) coordinates array of columnar regions."""
+    return np.column_stack([columns[field] for field in COORDINATE_FIELDS]).reshape(-1, 4)
+
+
+def columns_from_regions(regions_list, fields=REGION_FIELDS):
+    """Converts a list of region dicts to parallel arrays."""
+    return {field: [region[field] for region in regions_list] for field in fields}
+
+
+def regions_from_columns(columns):
+    """Converts parallel arrays back to a list of region dicts."""
+    fields = list(columns)
+    return [dict(zip(fields, values)) for values in zip(*(columns[field] for field in fields))]
+
+
+def is_columnar(regions):
+    """Whether the regions are in columnar (dict of arrays) form."""
+    return isinstance(regions, dict) and "xmin" in regions
+
+
+def region_count(regions):
+    """Number of regions in either the list or the columnar form."""
+    return len(regions["xmin"]) if is_columnar(regions) else len(regions)
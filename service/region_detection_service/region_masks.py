@@ -0,0 +1,83 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import cv2
+import numpy as np
+import torch
+
+from yolo.ultralytics.utils import ops
+
+# Mask encodings of the region output
+RLE_FORMAT = "rle"
+POLYGON_FORMAT = "polygon"
+
+
+def encode_masks(result, mask_format=RLE_FORMAT, resolution=0):
+    """
+    Encodes the instance masks of one segmentation result, one entry per box.
+
+    The masks are cropped out of the letterbox padding and resized so the longer side of the image
+    is at most `resolution` pixels (0 keeps the original image size), then encoded as COCO RLE
+    or as polygons in original image coordinates.
+
+    Parameters:
+    - result: ultralytics.engine.results.Results of a segmentation model.
+    - mask_format: 'rle' or 'polygon'.
+    - resolution: Longest side of the encoded masks in pixels, 0 for the original image size.
+
+    Returns:
+    - list of encoded masks aligned with result.boxes, or None when the model produced no masks.
+    """
+    if result.masks is None:
+        return None if result.boxes is None or len(result.boxes) else []
+    if mask_format not in (RLE_FORMAT, POLYGON_FORMAT):
+        raise ValueError(f"Unsupported mask format '{mask_format}', expected 'rle' or 'polygon'")
+
+    orig_height, orig_width = result.orig_shape
+    scale = min(1.0, resolution / max(orig_height, orig_width)) if resolution > 0 else 1.0
+    target_shape = (max(1, int(round(orig_height * scale))), max(1, int(round(orig_width * scale))))
+
+    # (n, h, w) -> (h, w, n) for scale_image, which removes the padding and resizes in one pass
+    masks = result.masks.data.cpu().numpy().astype(np.float32).transpose(1, 2, 0)
+    masks = ops.scale_image(masks, target_shape)
+    masks = np.ascontiguousarray((masks > 0.5).transpose(2, 0, 1), dtype=np.uint8)
+
+    if mask_format == RLE_FORMAT:
+        return [encode_rle(mask) for mask in masks]
+    gain = np.array([orig_width / target_shape[1], orig_height / target_shape[0]], dtype=np.float32)
+    return [np.round(segment * gain).astype(np.int64).ravel().tolist()
+            for segment in ops.masks2segments(torch.from_numpy(masks))]
+
+
+def encode_rle(mask):
+    """COCO RLE of a binary (h, w) mask: run lengths in column-major order, starting with a run of zeros."""
+    pixels = np.asarray(mask, dtype=np.uint8).ravel(order="F")
+    boundaries = np.flatnonzero(pixels[1:] != pixels[:-1]) + 1
+    counts = np.diff(np.concatenate(([0], boundaries, [pixels.size])))
+    if pixels.size and pixels[0]:
+        counts = np.concatenate(([0], counts))
+    return {"size": [int(mask.shape[0]), int(mask.shape[1])], "counts": counts.tolist()}
+
+
+def decode_rle(rle):
+    """Decodes a COCO RLE (uncompressed counts) back to a binary (h, w) mask."""
+    height, width = rle["size"]
+    counts = np.asarray(rle["counts"], dtype=np.int64)
+    values = (np.arange(len(counts)) % 2).astype(np.uint8)
+    return np.repeat(values, counts).reshape((height, width), order="F")
+
+
+def fill_mask(image_data, mask, color=(255, 255, 255)):
+    """Paints an encoded mask (RLE or polygon, as returned by encode_masks) onto the image in place."""
+    if isinstance(mask, dict):
+        binary_mask = decode_rle(mask)
+        if binary_mask.shape != image_data.shape[:2]:
+            binary_mask = cv2.resize(binary_mask, (image_data.shape[1], image_data.shape[0]),
+                                     interpolation=cv2.INTER_NEAREST)
+        image_data[binary_mask.astype(bool)] = color
+    elif len(mask) >= 6:
+        cv2.fillPoly(image_data, [np.asarray(mask, dtype=np.int32).reshape(-1, 2)], color)
+    return image_data
@@ -0,0 +1,114 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import os
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from service.region_detection_service.metrics import STAGE_SECONDS
+from service.region_detection_service.region_encoding import is_columnar, regions_from_columns
+from service.region_detection_service.region_masks import fill_mask
+
+_logger = logging.getLogger(__name__)
+
+
+class RegionRenderer:
+    """
+    Renders the progress images (annotated, merged, white mask and mask overlay) of a request.
+
+    All four outputs are drawn from the one decoded frame and JPEG-encoded in parallel
+    (cv2 releases the GIL), and each request writes into its own output directory.
+    """
+
+    def __init__(self, data_path, max_workers=4):
+        self.data_path = data_path
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="render")
+
+    def output_dir(self, request_id):
+        """Returns the directory the progress images of a request are written to."""
+        return os.path.join(self.data_path, request_id)
+
+    def render(self, request_id, image_array, regions_list, merged_coordinates):
+        """Renders and writes the four progress images of a request, returning the written paths."""
+        output_paths = []
+        try:
+            start_time = time.time()
+            # Drawing works per region, so columnar results are turned back into region dicts here
+            if is_columnar(regions_list):
+                regions_list = regions_from_columns(regions_list)
+            if is_columnar(merged_coordinates):
+                merged_coordinates = regions_from_columns(merged_coordinates)
+            output_dir = self.output_dir(request_id)
+            os.makedirs(output_dir, exist_ok=True)
+            jobs = [(self.__draw_bounding_boxes, regions_list, 'original_annotated'),
+                    (self.__draw_filled_regions, merged_coordinates, 'merged_overlap'),
+                    (self.__draw_white_mask, regions_list, 'white_mask'),
+                    (self.__draw_filled_regions, regions_list, 'white_mask_original')]
+            futures = [self.executor.submit(self.__write_image, draw_fn, image_array, coordinates_list,
+                                            os.path.join(output_dir, f"{image_name}.jpg"))
+                       for draw_fn, coordinates_list, image_name in jobs]
+            output_paths = [future.result() for future in futures]
+            render_time = time.time() - start_time
+            STAGE_SECONDS.labels("render").observe(render_time)
+            _logger.info("Output Progress Images written to %s in %.3fs" % (output_dir, render_time))
+        except Exception as e:
+            _logger.error(f"Output Progress Image Process failed! {repr(e)}")
+
+        return output_paths
+
+    def shutdown(self):
+        """Waits for the pending renders and releases the workers."""
+        self.executor.shutdown(wait=True)
+
+    @staticmethod
+    def __write_image(draw_fn, image_array, coordinates_list, image_path):
+        """Draws one progress image, encodes it and writes it to disk."""
+        image_data = draw_fn(image_array, coordinates_list)
+        success, encoded_image = cv2.imencode(".jpg", image_data)
+        if not success:
+            raise ValueError(f"Unable to encode {image_path}")
+        with open(image_path, "wb") as image_file:
+            image_file.write(encoded_image.tobytes())
+        return image_path
+
+    @staticmethod
+    def __draw_bounding_boxes(image_array, regions_list):
+        """Draws the detected region bounding boxes with their labels on a copy of the image."""
+        original_image = image_array.copy()
+        for region_data in regions_list:
+            x_min, y_min = region_data['xmin'], region_data['ymin']
+            x_max, y_max = region_data['xmax'], region_data['ymax']
+            label, accuracy = region_data['class_name'], region_data['confidence']
+            text = f'{label} ({accuracy:.2f})'
+            cv2.rectangle(original_image, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
+            cv2.putText(original_image, text, (x_min, y_min - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+        return original_image
+
+    @staticmethod
+    def __draw_white_mask(image_array, coordinates_list):
+        """Draws the regions as a white mask on a black image."""
+        white_mask_image = np.zeros_like(image_array)
+        return RegionRenderer.__fill_regions(white_mask_image, coordinates_list)
+
+    @staticmethod
+    def __draw_filled_regions(image_array, coordinates_list):
+        """Draws the regions as filled white rectangles over a copy of the image."""
+        return RegionRenderer.__fill_regions(image_array.copy(), coordinates_list)
+
+    @staticmethod
+    def __fill_regions(image_data, coordinates_list):
+        """Fills the mask of every region, or its box when it has no mask."""
+        for region in coordinates_list:
+            if region.get('mask') is not None:
+                fill_mask(image_data, region['mask'], (255, 255, 255))
+            else:
+                cv2.rectangle(image_data, (region['xmin'], region['ymin']), (region['xmax'], region['ymax']),
+                              (255, 255, 255), thickness=cv2.FILLED)
+        return image_data
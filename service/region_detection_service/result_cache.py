@@ -0,0 +1,178 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import os
+import asyncio
+import json
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from service.region_detection_service.metrics import CACHE_LOOKUPS
+
+_logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Content-addressed cache of region extraction results.
+
+    Entries are keyed by a hash of the image bytes plus everything that changes the output
+    (model name, confidence and label set). An in-memory LRU tier is evicted by size and TTL,
+    and an optional on-disk tier keeps results across restarts. For image links the cache also
+    remembers the ETag / Last-Modified validators so unchanged images don't have to be downloaded.
+    On the event loop use lookup(), which reads the disk tier off the loop; put() writes it in the background.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=3600, disk_path=None):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path or None
+        self._writer = None
+        if self.disk_path:
+            os.makedirs(self.disk_path, exist_ok=True)
+            # Disk tier writes are serialized on one background thread
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache_writer")
+        # key -> (created_time, value)
+        self._entries = OrderedDict()
+        # url -> (etag, last_modified, key)
+        self._url_validators = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    @staticmethod
+    def make_key(image_bytes, model_name, confidence, labels, variant=""):
+        """Builds the cache key from the image content, the detection settings and the output variant."""
+        digest = hashlib.sha256(image_bytes)
+        digest.update(f"|{model_name}|{confidence}|{','.join(sorted(labels))}|{variant}".encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Returns the cached (region_data, merged_coordinates) for the key, or None. Reads disk in this thread."""
+        value = self.__get_memory(key)
+        return value if value is not None else self.__get_disk(key)
+
+    async def lookup(self, key):
+        """Same as get() for the event loop: a memory miss reads the disk tier on the default executor."""
+        value = self.__get_memory(key)
+        if value is not None or not self.disk_path:
+            return value if value is not None else self.__get_disk(key)
+        return await asyncio.get_running_loop().run_in_executor(None, self.__get_disk, key)
+
+    def put(self, key, value):
+        """Stores (region_data, merged_coordinates) for the key, the disk tier is written in the background."""
+        entry = (time.time(), value)
+        with self._lock:
+            self.__store(key, entry)
+        if self._writer is not None:
+            self._writer.submit(self.__write_disk, key, entry)
+
+    def close(self):
+        """Waits for the pending disk tier writes."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+
+    def get_url_validators(self, url):
+        """Returns (etag, last_modified, key) last seen for the URL, or None."""
+        with self._lock:
+            return self._url_validators.get(url)
+
+    def put_url_validators(self, url, etag, last_modified, key):
+        """Remembers the validators of a downloaded URL and the cache key of its content."""
+        if not (etag or last_modified):
+            return
+        with self._lock:
+            self._url_validators[url] = (etag, last_modified, key)
+            self._url_validators.move_to_end(url)
+            while len(self._url_validators) > self.max_entries:
+                self._url_validators.popitem(last=False)
+
+    def stats(self):
+        """Returns the hit / miss counters and the current size of the memory tier."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "disk_hits": self.disk_hits,
+                    "hit_rate": self.hits / lookups if lookups else 0.0, "entries": len(self._entries)}
+
+    def __store(self, key, entry):
+        """Adds the entry to the memory tier, evicting the least recently used ones. Caller holds the lock."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __get_memory(self, key):
+        """Returns the value of an unexpired memory tier entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self.__expired(entry[0]):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    CACHE_LOOKUPS.labels("hit").inc()
+                    return entry[1]
+                del self._entries[key]
+        return None
+
+    def __get_disk(self, key):
+        """Returns the value of a disk tier entry and promotes it to the memory tier, or counts the miss."""
+        entry = self.__read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                CACHE_LOOKUPS.labels("miss").inc()
+                return None
+            # Promote the disk entry to the memory tier
+            self.__store(key, entry)
+            self.hits += 1
+            self.disk_hits += 1
+            CACHE_LOOKUPS.labels("disk_hit").inc()
+            return entry[1]
+
+    def __expired(self, created_time):
+        return self.ttl_seconds > 0 and time.time() - created_time > self.ttl_seconds
+
+    def __read_disk(self, key):
+        """Loads an entry from the disk tier, dropping it if it has expired."""
+        if not self.disk_path:
+            return None
+        file_path = os.path.join(self.disk_path, f"{key}.json")
+        try:
+            with open(file_path, "r") as cache_file:
+                data = json.load(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            _logger.error(f"Result Cache Reading Process failed! {repr(e)}")
+            return None
+
+        if self.__expired(data["created"]):
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+            return None
+        return data["created"], (data["region_data"], data["merged_coordinates"])
+
+    def __write_disk(self, key, entry):
+        """Writes an entry to the disk tier atomically."""
+        if not self.disk_path:
+            return
+        file_path = os.path.join(self.disk_path, f"{key}.json")
+        temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        try:
+            region_data, merged_coordinates = entry[1]
+            with open(temp_path, "w") as cache_file:
+                json.dump({"created": entry[0], "region_data": region_data,
+                           "merged_coordinates": merged_coordinates}, cache_file)
+            os.replace(temp_path, file_path)
+        except Exception as e:
+            _logger.error(f"Result Cache Writing Process failed! {repr(e)}")
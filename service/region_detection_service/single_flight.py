@@ -0,0 +1,49 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+import logging
+
+from service.region_detection_service.metrics import DEDUPLICATED_REQUESTS
+
+_logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical work into one computation.
+
+    The first caller for a key starts the computation as a task, callers arriving with the same key
+    while it is still running await that task and share its result (or its exception). The task is
+    shielded from the callers, so a client that disconnects doesn't cancel the work for the others.
+    """
+
+    def __init__(self):
+        # key -> asyncio.Task of the computation in flight
+        self._in_flight = {}
+
+    def __contains__(self, key):
+        return key in self._in_flight
+
+    async def run(self, key, coroutine_fn, *args):
+        """Returns the result of coroutine_fn(*args), joining the computation already in flight for the key."""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coroutine_fn(*args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda finished: self.__finish(key, finished))
+        else:
+            DEDUPLICATED_REQUESTS.inc()
+            _logger.debug("Joined the computation in flight for %s", key)
+        return await asyncio.shield(task)
+
+    def __finish(self, key, task):
+        """Forgets the finished computation, so the next request computes (or hits the cache) again."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved when every caller has gone away
+        if not task.cancelled():
+            task.exception()
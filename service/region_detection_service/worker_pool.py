@@ -0,0 +1,99 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from service.region_detection_service.metrics import QUEUE_DEPTH
+
+_logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """ Raised when the worker pool and its queue are full and the request has to be rejected """
+    pass
+
+
+class InferenceWorkerPool:
+    """
+    Bounded pool that runs blocking inference, rendering and I/O off the asyncio event loop.
+
+    At most `pool_size` calls run at once and at most `queue_depth` more wait for a worker.
+    Anything beyond that is rejected straight away with PoolSaturatedError, so a burst of traffic
+    turns into fast 503s instead of an ever-growing backlog.
+    """
+
+    def __init__(self, pool_size=4, queue_depth=32, timeout=30, pool_type="thread"):
+        self.pool_size = max(1, pool_size)
+        self.queue_depth = max(0, queue_depth)
+        self.timeout = timeout
+        self.pool_type = pool_type
+        if pool_type == "process":
+            # Callables and their arguments must be picklable in process mode
+            self.executor = ProcessPoolExecutor(max_workers=self.pool_size)
+        elif pool_type == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="inference")
+        else:
+            raise ValueError(f"Unsupported worker pool type '{pool_type}', expected 'thread' or 'process'")
+        self._pending = 0
+
+    @property
+    def pending(self):
+        """Number of calls currently running or waiting for a worker."""
+        return self._pending
+
+    @property
+    def capacity(self):
+        """Maximum number of calls accepted at the same time."""
+        return self.pool_size + self.queue_depth
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Runs fn(*args, **kwargs) on the pool and waits for its result.
+
+        Raises:
+        - PoolSaturatedError: The pool and its queue are full.
+        - asyncio.TimeoutError: The call did not finish within the configured timeout.
+        """
+        if self._pending >= self.capacity:
+            raise PoolSaturatedError(f"Worker pool is saturated ({self._pending} requests in flight)")
+        return await asyncio.wait_for(self.submit(fn, *args, **kwargs), self.timeout)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedules fn(*args, **kwargs) on the pool without the capacity check or timeout and returns an asyncio future.
+
+        The call counts as pending until the worker has actually finished it: a caller that stops waiting
+        (timeout, cancellation) cancels it only while it is still queued, a running call keeps its worker busy.
+        """
+        loop = asyncio.get_running_loop()
+        self.__update_pending(1)
+        try:
+            concurrent_future = self.executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self.__update_pending(-1)
+            raise
+        concurrent_future.add_done_callback(functools.partial(self.__finished, loop))
+        return asyncio.wrap_future(concurrent_future, loop=loop)
+
+    def __finished(self, loop, _):
+        """Done-callback of a call, run in the worker: releases its slot on the event loop."""
+        try:
+            loop.call_soon_threadsafe(self.__update_pending, -1)
+        except RuntimeError:
+            # The event loop is already closed at shutdown
+            pass
+
+    def __update_pending(self, delta):
+        """Adjusts the number of pending calls and its gauge."""
+        self._pending += delta
+        QUEUE_DEPTH.labels("pool").set(self._pending)
+
+    def shutdown(self):
+        """Stops accepting work and releases the workers."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,42 +1,31 @@
 import os
-import requests
 
-from src.utils_files.config_reader import ConfigReader
+import cv2
+import numpy as np
 
-# Load configuration from config.ini
-config_mgr = ConfigReader().config_reader()
+from src.utils_files.settings import get_settings
 
 # Directory to store uploaded files
-UPLOAD_DIR = config_mgr.get("OUTPUT", "IMAGES_PATH")
+UPLOAD_DIR = get_settings().output.images_path
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
-def save_uploaded_file(file, destination):
-    """ Save the Uploaded Image to the specified location """
+def save_image_bytes(image_bytes, destination):
+    """ Save the raw image bytes to the specified location """
     with open(destination, "wb") as dest_file:
-        dest_file.write(file.file.read())
+        dest_file.write(image_bytes)
 
 
-def save_image_from_server(url, local_path):
+def decode_image_bytes(image_bytes):
     """
-    Save an image from a given URL to the local path.
+    Decode raw image bytes into a BGR image array without a disk round-trip.
 
     Parameters:
-    - url: URL of the image.
-    - local_path: Local path to save the image.
+    - image_bytes: Encoded image content (JPEG, PNG, ...).
 
     Returns:
-    - str: Path to the saved image.
+    - numpy.ndarray: Decoded image, or None if the bytes are not a valid image.
     """
-    image_path = local_path + '/input.jpg'
-    response = requests.get(url, stream=True)
-    if response.status_code == 200:
-        with open(image_path, 'wb') as file:
-            for chunk in response.iter_content(chunk_size=128):
-                file.write(chunk)
-        print(f"Image saved to {image_path}")
-    else:
-        image_path = ''
-        print(f"Failed to download image. Status code: {response.status_code}")
-
-    return image_path
+    if not image_bytes:
+        return None
+    return cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
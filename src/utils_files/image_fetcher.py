@@ -0,0 +1,94 @@
+import logging
+from collections import namedtuple
+
+import httpx
+
+_logger = logging.getLogger(__name__)
+
+# Result of a download; content is None when the server answered 304 Not Modified
+FetchedImage = namedtuple("FetchedImage", ["content", "etag", "last_modified", "not_modified"])
+
+
+class ImageFetchError(Exception):
+    """ Class to handle exception raised while downloading an image, with the HTTP status to report """
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ImageFetcher:
+    """
+    Async image downloader sharing one keep-alive connection pool across requests.
+
+    The body is streamed in large chunks into memory and capped at `max_bytes`, so a huge or
+    endless response can't exhaust the server, and nothing is written to disk.
+    """
+
+    def __init__(self, max_bytes=20 * 1024 * 1024, connect_timeout=5.0, read_timeout=20.0,
+                 chunk_size=64 * 1024, max_connections=20):
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client = None
+
+    async def start(self):
+        """Opens the shared connection pool."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, follow_redirects=True)
+
+    async def close(self):
+        """Closes the shared connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch(self, url, etag=None, last_modified=None):
+        """
+        Download an image into memory.
+
+        Parameters:
+        - url: URL of the image.
+        - etag, last_modified: Validators from a previous download, sent as a conditional request.
+
+        Returns:
+        - FetchedImage: Raw image content and the validators returned by the server.
+
+        Raises:
+        - ImageFetchError: The download failed, timed out or exceeded the size limit.
+        """
+        if self._client is None:
+            await self.start()
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        try:
+            async with self._client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and headers:
+                    return FetchedImage(None, etag, last_modified, True)
+                if response.status_code != 200:
+                    raise ImageFetchError(f"Failed to download image. Status code: {response.status_code}")
+
+                # Reject early when the server announces a body over the limit
+                content_length = response.headers.get("Content-Length")
+                if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+                    raise ImageFetchError(f"Image exceeds the {self.max_bytes} bytes limit.", status_code=413)
+
+                image_bytes = bytearray()
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    image_bytes.extend(chunk)
+                    if len(image_bytes) > self.max_bytes:
+                        raise ImageFetchError(f"Image exceeds the {self.max_bytes} bytes limit.", status_code=413)
+
+        except httpx.TimeoutException as e:
+            _logger.error(f"Image download timed out! {repr(e)}")
+            raise ImageFetchError("Image download timed out.", status_code=504)
+        except httpx.HTTPError as e:
+            _logger.error(f"Image download failed! {repr(e)}")
+            raise ImageFetchError(f"Unable to download the image: {str(e)}")
+
+        return FetchedImage(bytes(image_bytes), response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"), False)
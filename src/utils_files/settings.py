@@ -0,0 +1,233 @@
+import logging
+import os
+import signal
+import threading
+from configparser import ConfigParser
+from dataclasses import dataclass, fields, replace
+from typing import Tuple
+
+_logger = logging.getLogger(__name__)
+
+# Environment variables override config.ini values as REGION_<SECTION>_<KEY>, e.g. REGION_YOLO_DEVICE=cuda:0
+ENV_PREFIX = "REGION_"
+# Path of the configuration file, defaults to config/config.ini under the working directory
+CONFIG_PATH_ENV = "REGION_CONFIG_PATH"
+
+
+@dataclass(frozen=True)
+class YoloSettings:
+    model: str = "yolov8n.pt"
+    device: str = "cpu"
+    half: bool = False
+    imgsz: int = 640
+    confidence: float = 0.2
+    labels: Tuple[str, ...] = ()
+    backend: str = "pytorch"
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    predictors: int = 1
+
+
+@dataclass(frozen=True)
+class MergeSettings:
+    metric: str = "intersect"
+    threshold: float = 0.0
+
+
+@dataclass(frozen=True)
+class MaskSettings:
+    enabled: bool = False
+    format: str = "rle"
+    resolution: int = 0
+    native: bool = False
+
+
+@dataclass(frozen=True)
+class OutputSettings:
+    images_path: str = "./data"
+    save_images: bool = False
+    save_uploads: bool = False
+    render_workers: int = 4
+
+
+@dataclass(frozen=True)
+class BatchingSettings:
+    max_batch_size: int = 8
+    max_wait_ms: int = 10
+    max_images_per_request: int = 64
+    request_concurrency: int = 8
+    bucket_by_shape: bool = True
+
+
+@dataclass(frozen=True)
+class DownloadSettings:
+    max_bytes: int = 20 * 1024 * 1024
+    connect_timeout: float = 5.0
+    read_timeout: float = 20.0
+    chunk_size: int = 64 * 1024
+    max_connections: int = 20
+
+
+@dataclass(frozen=True)
+class CacheSettings:
+    enabled: bool = False
+    max_entries: int = 1024
+    ttl_seconds: float = 3600.0
+    disk_path: str = ""
+
+
+@dataclass(frozen=True)
+class LoggingSettings:
+    file_prefix: str = "Python-Assignment"
+    max_bytes: int = 10 * 1024 * 1024
+    backup_count: int = 5
+    format: str = "text"
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    host: str = "localhost"
+    ipaddr: str = "8.8.8.8"
+    port: int = 8080
+    workers: int = 1
+    torch_threads: int = 0
+    pool_type: str = "thread"
+    pool_size: int = 4
+    queue_depth: int = 32
+    request_timeout: float = 30.0
+
+
+@dataclass(frozen=True)
+class Settings:
+    """ Typed, immutable view of config.ini (with environment overrides) """
+    yolo: YoloSettings = YoloSettings()
+    merge: MergeSettings = MergeSettings()
+    masks: MaskSettings = MaskSettings()
+    output: OutputSettings = OutputSettings()
+    batching: BatchingSettings = BatchingSettings()
+    download: DownloadSettings = DownloadSettings()
+    cache: CacheSettings = CacheSettings()
+    logging: LoggingSettings = LoggingSettings()
+    server: ServerSettings = ServerSettings()
+
+
+# Settings attribute -> config.ini section
+_SECTIONS = {"yolo": "YOLO", "merge": "MERGE", "masks": "MASKS", "output": "OUTPUT", "batching": "BATCHING",
+             "download": "DOWNLOAD", "cache": "CACHE", "logging": "LOGGING", "server": "SERVER_CONFIG"}
+
+_settings = None
+_settings_lock = threading.Lock()
+_reload_callbacks = []
+
+
+def parse_labels(value):
+    """ Parses a label list such as `[chair, couch, dining table]` into a tuple of names """
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        value = value[1:-1]
+    return tuple(label.strip() for label in value.split(",") if label.strip())
+
+
+def _convert(value, default):
+    """ Converts a raw string to the type of the field default """
+    if isinstance(default, bool):
+        lowered = value.strip().lower()
+        if lowered not in ConfigParser.BOOLEAN_STATES:
+            raise ValueError(f"Not a boolean: {value}")
+        return ConfigParser.BOOLEAN_STATES[lowered]
+    if isinstance(default, tuple):
+        return parse_labels(value)
+    if isinstance(default, (int, float)):
+        return type(default)(value.strip())
+    return value.strip()
+
+
+def load_settings(config_path=None, environ=None):
+    """
+    Reads config.ini once into a frozen Settings object.
+
+    Every value can be overridden with an environment variable named REGION_<SECTION>_<KEY>
+    (e.g. REGION_SERVER_CONFIG_POOL_SIZE=8). Missing keys keep their defaults.
+    """
+    environ = os.environ if environ is None else environ
+    config_path = config_path or environ.get(CONFIG_PATH_ENV) or os.path.join(os.getcwd(), "config", "config.ini")
+    config_mgr = ConfigParser()
+    if not config_mgr.read(config_path):
+        _logger.warning("Config File %s not found, using defaults and environment overrides", config_path)
+
+    settings = Settings()
+    for attribute, section in _SECTIONS.items():
+        section_settings = getattr(settings, attribute)
+        values = {}
+        for setting in fields(section_settings):
+            key = setting.name.upper()
+            raw_value = environ.get(f"{ENV_PREFIX}{section}_{key}")
+            if raw_value is None:
+                raw_value = config_mgr.get(section, key, fallback=None)
+            if raw_value is None:
+                continue
+            try:
+                values[setting.name] = _convert(raw_value, setting.default)
+            except ValueError as e:
+                raise ValueError(f"Invalid value for [{section}] {key}: {raw_value!r}") from e
+        settings = replace(settings, **{attribute: replace(section_settings, **values)})
+    _logger.info("Config File Reading process is completed")
+    return settings
+
+
+def get_settings():
+    """ Returns the current settings, loading them on first use """
+    global _settings
+    settings = _settings
+    if settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = load_settings()
+            settings = _settings
+    return settings
+
+
+def on_reload(callback):
+    """ Registers callback(old_settings, new_settings), called after every successful reload """
+    _reload_callbacks.append(callback)
+    return callback
+
+
+def reload_settings():
+    """
+    Re-reads the configuration and swaps it in atomically.
+
+    The new settings are only published when they load and every reload callback succeeds,
+    otherwise the running configuration is kept.
+    """
+    global _settings
+    with _settings_lock:
+        old_settings = _settings
+        try:
+            new_settings = load_settings()
+            if new_settings == old_settings:
+                _logger.info("Configuration is unchanged, nothing to reload")
+                return old_settings
+            for callback in _reload_callbacks:
+                callback(old_settings, new_settings)
+        except Exception as e:
+            _logger.error("Configuration reload failed, keeping the running configuration! %r", e)
+            return old_settings
+        _settings = new_settings
+        _logger.info("Configuration reloaded")
+        return new_settings
+
+
+def install_reload_signal(loop, executor=None):
+    """
+    Reloads the configuration on SIGHUP, off the event loop. Returns False without hot reload where
+    the signal can't be handled: no SIGHUP (Windows), or an event loop outside the main thread (e.g. TestClient).
+    """
+    if not hasattr(signal, "SIGHUP"):
+        return False
+    try:
+        loop.add_signal_handler(signal.SIGHUP, lambda: loop.run_in_executor(executor, reload_settings))
+    except (RuntimeError, NotImplementedError, ValueError) as e:
+        _logger.warning("Configuration hot reload on SIGHUP is not available, a restart is required! %r", e)
+        return False
+    return True
@@ -1,42 +1,168 @@
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 import time
+from contextlib import contextmanager
 
 
 # Create a logger based on module name
 _LOGGER = logging.getLogger(__name__)
 
+# Request id of the current request, attached to every log record
+_REQUEST_ID = contextvars.ContextVar("request_id", default="-")
 
-def setup_root_logger(prefix: str):
+# The root logger is only set up once per process
+_SETUP_LOCK = threading.Lock()
+_LOG_FILE = None
+_LISTENER = None
+_QUEUE_HANDLER = None
+
+
+def setup_root_logger(prefix: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                      log_format: str = "text"):
     """
-    Creates a root logger which logs all INFO messages to a file given a prefix
+    Creates a root logger which logs all INFO messages to a rotating file given a prefix
     The log file name is returned.
+
+    Log records are put on an in-memory queue by the calling thread and written to disk by a
+    background QueueListener, so request threads never wait on file I/O. Calling it again is a
+    no-op, the handlers are only installed once per process.
+    """
+    global _LOG_FILE
+
+    with _SETUP_LOCK:
+        if _LISTENER is not None:
+            return _LOG_FILE
+
+        # Generate logging file
+        log_root = os.getcwd() + '/logger/'
+        os.makedirs(log_root, exist_ok=True)
+        if log_format == "json":
+            formatter = StructuredFormatter()
+        else:
+            formatter = logging.Formatter("%(asctime)s - %(module)s - %(levelname)s - [%(request_id)s] %(message)s",
+                                          datefmt="%m/%d/%Y %H:%M:%S")
+
+        def start_listener(log_file):
+            """ Routes the root logger through a fresh queue to a listener writing the log file """
+            global _LISTENER, _QUEUE_HANDLER
+            file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                                                backupCount=backup_count)
+            file_handler.setLevel(logging.INFO)
+            file_handler.setFormatter(formatter)
+
+            # Set root logger to send all INFO messages through the queue to the log file
+            log_queue = queue.SimpleQueue()
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            queue_handler.addFilter(RequestContextFilter())
+            if _QUEUE_HANDLER is not None:
+                logging.getLogger().removeHandler(_QUEUE_HANDLER)
+            logging.getLogger().addHandler(queue_handler)
+            logging.getLogger().setLevel(logging.INFO)
+            _QUEUE_HANDLER = queue_handler
+            _LISTENER = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+            _LISTENER.start()
+            return log_file
+
+        def restart_listener_after_fork():
+            """
+            The listener thread does not survive a fork, so forked workers get their own listener.
+            Each worker writes its own file so that processes never race on rotation.
+            """
+            global _LOG_FILE
+            if _LISTENER is not None:
+                _LOG_FILE = start_listener(f'{log_root}/{prefix}_{os.getpid()}.log')
+
+        _LOG_FILE = start_listener(f'{log_root}/{prefix}.log')
+        os.register_at_fork(after_in_child=restart_listener_after_fork)
+        atexit.register(shutdown_root_logger)
+        return _LOG_FILE
+
+
+def shutdown_root_logger():
+    """ Flushes the queued log records to disk and stops the background listener """
+    global _LISTENER
+    with _SETUP_LOCK:
+        if _LISTENER is not None:
+            _LISTENER.stop()
+            _LISTENER = None
+
+
+def set_request_id(request_id):
+    """ Tags the log records of the current context with the request id, returns a token for reset_request_id """
+    return _REQUEST_ID.set(request_id)
+
+
+def reset_request_id(token):
+    """ Restores the request id that was active before set_request_id """
+    _REQUEST_ID.reset(token)
+
+
+def get_request_id():
+    """ Returns the request id of the current context """
+    return _REQUEST_ID.get()
+
+
+class RequestContextFilter(logging.Filter):
+    """ Adds the request id of the current context to every log record """
+
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = _REQUEST_ID.get()
+        return True
+
+
+class StructuredFormatter(logging.Formatter):
+    """ Formats log records as one JSON object per line """
+
+    def format(self, record):
+        entry = {"time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"), "level": record.levelname,
+                 "module": record.module, "request_id": getattr(record, "request_id", "-"),
+                 "message": record.getMessage()}
+        for key in ("stages_ms", "total_ms"):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class StageTimer:
     """
+    Collects the duration of the stages of one request and logs them as a single record.
+
+    Example:
+        timer = StageTimer(request_id)
+        with timer.stage("decode"):
+            ...
+        timer.log(_LOGGER)
+    """
+
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.stages = {}
+        self.start_time = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        """ Times the wrapped block and adds it to the named stage """
+        stage_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - stage_start) * 1E3
 
-    # Generate logging file
-    log_root = os.getcwd() + '/logger/'
-    os.makedirs(log_root, exist_ok=True)
-    # if os.getenv("PYTHON_LOG_ROOT") is None:
-    #     raise RuntimeError("Environment variable PYTHON_LOG_ROOT is not set! Exiting..")
-    # curr_time = time.localtime()
-    # log_file = "%s/%s_%04d%02d%02d-%02d%02d%02d.log" % (
-    #     log_root,
-    #     prefix,
-    #     curr_time.tm_year,
-    #     curr_time.tm_mon,
-    #     curr_time.tm_mday,
-    #     curr_time.tm_hour,
-    #     curr_time.tm_min,
-    #     curr_time.tm_sec)
-    log_file = f'{log_root}/{prefix}.log'
-    # Set root logger to send all INFO messages to a log file
-    formatter = logging.Formatter("%(asctime)s - %(module)s - %(levelname)s - %(message)s", datefmt="%m/%d/%Y %H:%M:%S")
-    ch = logging.FileHandler(log_file)
-    ch.setLevel(logging.INFO)
-    ch.setFormatter(formatter)
-    logging.getLogger().addHandler(ch)
-    logging.getLogger().setLevel(logging.INFO)
-    return log_file
+    def log(self, logger, message="Request completed"):
+        """ Logs the stage timings of the request as one structured record """
+        total_ms = round((time.perf_counter() - self.start_time) * 1E3, 2)
+        stages_ms = {name: round(duration, 2) for name, duration in self.stages.items()}
+        logger.info("%s in %.2fms %s", message, total_ms, stages_ms,
+                    extra={"request_id": self.request_id, "stages_ms": stages_ms, "total_ms": total_ms})
 
 
 class MigrationException(Exception):
@@ -0,0 +1,104 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+import threading
+
+import pytest
+
+from service.region_detection_service.batch_scheduler import BatchScheduler
+
+
+def run_scheduler(scenario, predict, **kwargs):
+    """ Runs scenario(scheduler) against a started scheduler and returns its result """
+    async def main():
+        scheduler = BatchScheduler(predict, **kwargs)
+        await scheduler.start()
+        try:
+            return await scenario(scheduler)
+        finally:
+            await scheduler.stop()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_images_share_one_predictor_call():
+    calls = []
+
+    def predict(image_arrays):
+        calls.append(list(image_arrays))
+        return [image_array * 10 for image_array in image_arrays]
+
+    async def scenario(scheduler):
+        return await asyncio.gather(*(scheduler.submit(i) for i in range(5)))
+
+    assert run_scheduler(scenario, predict, max_batch_size=8, max_wait_ms=50) == [0, 10, 20, 30, 40]
+    assert calls == [[0, 1, 2, 3, 4]]
+
+
+def test_batches_are_split_at_the_max_batch_size():
+    calls = []
+
+    def predict(image_arrays):
+        calls.append(list(image_arrays))
+        return list(image_arrays)
+
+    async def scenario(scheduler):
+        return await asyncio.gather(*(scheduler.submit(i) for i in range(5)))
+
+    assert run_scheduler(scenario, predict, max_batch_size=2, max_wait_ms=50) == [0, 1, 2, 3, 4]
+    assert calls == [[0, 1], [2, 3], [4]]
+
+
+def test_failed_batch_fails_all_its_requests():
+    def predict(image_arrays):
+        raise ValueError("inference failed")
+
+    async def scenario(scheduler):
+        return await asyncio.gather(*(scheduler.submit(i) for i in range(3)), return_exceptions=True)
+
+    errors = run_scheduler(scenario, predict, max_batch_size=8, max_wait_ms=50)
+    assert [type(error) for error in errors] == [ValueError] * 3
+
+
+def test_full_queue_rejects_the_submit():
+    release = threading.Event()
+
+    def predict(image_arrays):
+        release.wait()
+        return list(image_arrays)
+
+    async def scenario(scheduler):
+        # The first image blocks the only predictor call slot, the second one fills the queue behind it
+        waiting = [asyncio.ensure_future(scheduler.submit(0))]
+        await asyncio.sleep(0.05)
+        waiting.append(asyncio.ensure_future(scheduler.submit(1)))
+        await asyncio.sleep(0.05)
+        with pytest.raises(asyncio.QueueFull):
+            await scheduler.submit(2)
+        release.set()
+        return await asyncio.gather(*waiting)
+
+    try:
+        assert run_scheduler(scenario, predict, max_batch_size=1, max_wait_ms=0, max_queue_size=1) == [0, 1]
+    finally:
+        release.set()
+
+
+def test_images_are_predicted_per_bucket_in_order_of_arrival():
+    calls = []
+
+    def predict(image_arrays):
+        calls.append(list(image_arrays))
+        return list(image_arrays)
+
+    async def scenario(scheduler):
+        return await asyncio.gather(*(scheduler.submit(i) for i in [1, 2, 4, 3, 6, 5]))
+
+    results = run_scheduler(scenario, predict, max_batch_size=8, max_wait_ms=50, bucket_fn=lambda i: i % 2,
+                            max_concurrent_batches=2)
+    assert results == [1, 2, 4, 3, 6, 5]
+    assert sorted(calls) == [[1, 3, 5], [2, 4, 6]]
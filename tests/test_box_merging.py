@@ -0,0 +1,85 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import numpy as np
+import pytest
+
+from service.region_detection_service import box_merging
+from service.region_detection_service.box_merging import merge_overlapping_boxes
+
+
+def brute_force_connected(box_i, box_j, metric, threshold):
+    """ Reference overlap test of one pair of boxes """
+    inter_w = min(box_i[2], box_j[2]) - max(box_i[0], box_j[0])
+    inter_h = min(box_i[3], box_j[3]) - max(box_i[1], box_j[1])
+    if inter_w < 0 or inter_h < 0:
+        return False
+    if metric == "intersect":
+        return True
+    inter = inter_w * inter_h
+    area_i = (box_i[2] - box_i[0]) * (box_i[3] - box_i[1])
+    area_j = (box_j[2] - box_j[0]) * (box_j[3] - box_j[1])
+    denominator = area_i + area_j - inter if metric == "iou" else min(area_i, area_j)
+    return denominator > 0 and inter / denominator > threshold
+
+
+def brute_force_merge(boxes, metric, threshold):
+    """ Reference merge: depth-first search over all pairs, repeated until the merged boxes are stable """
+    boxes = [tuple(box) for box in boxes]
+    while True:
+        component = [-1] * len(boxes)
+        for seed in range(len(boxes)):
+            if component[seed] >= 0:
+                continue
+            component[seed] = seed
+            stack = [seed]
+            while stack:
+                i = stack.pop()
+                for j in range(len(boxes)):
+                    if component[j] < 0 and brute_force_connected(boxes[i], boxes[j], metric, threshold):
+                        component[j] = seed
+                        stack.append(j)
+        groups = {}
+        for box, root in zip(boxes, component):
+            groups.setdefault(root, []).append(box)
+        merged = [(min(b[0] for b in group), min(b[1] for b in group), max(b[2] for b in group),
+                   max(b[3] for b in group)) for group in groups.values()]
+        if len(merged) == len(boxes):
+            return sorted(merged)
+        boxes = merged
+
+
+def random_boxes(rng, n, extent=1000, max_size=120):
+    xy = rng.integers(0, extent, size=(n, 2))
+    wh = rng.integers(0, max_size, size=(n, 2))
+    return np.concatenate([xy, xy + wh], axis=1).astype(np.float64)
+
+
+@pytest.mark.parametrize("metric, threshold", [("intersect", 0.0), ("iou", 0.1), ("ioa", 0.3)])
+@pytest.mark.parametrize("seed", range(5))
+def test_merge_matches_brute_force(monkeypatch, metric, threshold, seed):
+    # Small chunks so the sweep is split across many chunks
+    monkeypatch.setattr(box_merging, "_MAX_PAIRS_PER_CHUNK", 7)
+    rng = np.random.default_rng(seed)
+    boxes = random_boxes(rng, 60)
+
+    merged, labels = merge_overlapping_boxes(boxes, metric, threshold)
+    assert sorted(map(tuple, merged.tolist())) == brute_force_merge(boxes.tolist(), metric, threshold)
+    assert np.all(np.diff(merged[:, 0]) >= 0)
+    # Every input box lies inside the merged box it is mapped to
+    assert np.all(merged[labels, :2] <= boxes[:, :2]) and np.all(merged[labels, 2:] >= boxes[:, 2:])
+
+
+def test_touching_chain_collapses_into_one_region():
+    boxes = [[0, 0, 10, 10], [10, 0, 20, 10], [20, 5, 30, 15], [50, 50, 60, 60]]
+    merged, labels = merge_overlapping_boxes(boxes)
+    assert merged.tolist() == [[0, 0, 30, 15], [50, 50, 60, 60]]
+    assert labels.tolist() == [0, 0, 0, 1]
+
+
+def test_no_boxes():
+    merged, labels = merge_overlapping_boxes([])
+    assert merged.shape == (0, 4) and labels.shape == (0,)
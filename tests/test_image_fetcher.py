@@ -0,0 +1,118 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils_files.image_fetcher import ImageFetcher, ImageFetchError
+
+IMAGE_BYTES = b"\xff\xd8" + bytes(range(256)) * 16
+ETAG = '"v1"'
+
+
+class StubImageHandler(BaseHTTPRequestHandler):
+    """ Serves the test image, an oversized one with and without Content-Length and a slow one """
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionError:
+            # The client gave up on the body (size cap, timeout)
+            pass
+
+    def do_GET(self):
+        if self.path == "/image.jpg":
+            if self.headers.get("If-None-Match") == ETAG:
+                self.send_response(304)
+                self.send_header("ETag", ETAG)
+                self.end_headers()
+                return
+            self.__send_body(IMAGE_BYTES, {"ETag": ETAG, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        elif self.path == "/large.jpg":
+            self.__send_body(IMAGE_BYTES * 4)
+        elif self.path == "/large_unannounced.jpg":
+            # No Content-Length, the body ends when the connection is closed
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(IMAGE_BYTES * 4)
+            self.close_connection = True
+        elif self.path == "/slow.jpg":
+            time.sleep(1)
+            self.__send_body(IMAGE_BYTES)
+        else:
+            self.send_error(404)
+
+    def __send_body(self, body, headers=None):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubImageHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(url, **kwargs):
+    """ Runs one download on a fresh fetcher with a size cap of two test images and a short read timeout """
+    async def run():
+        image_fetcher = ImageFetcher(max_bytes=len(IMAGE_BYTES) * 2, connect_timeout=1.0, read_timeout=0.2)
+        try:
+            return await image_fetcher.fetch(url, **kwargs)
+        finally:
+            await image_fetcher.close()
+
+    return asyncio.run(run())
+
+
+def test_fetch_returns_content_and_validators(stub_server):
+    fetched = fetch(f"{stub_server}/image.jpg")
+    assert fetched.content == IMAGE_BYTES
+    assert fetched.etag == ETAG
+    assert fetched.last_modified == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert not fetched.not_modified
+
+
+def test_conditional_fetch_of_unchanged_image_is_not_modified(stub_server):
+    fetched = fetch(f"{stub_server}/image.jpg", etag=ETAG)
+    assert fetched.not_modified
+    assert fetched.content is None
+    assert fetched.etag == ETAG
+
+
+@pytest.mark.parametrize("path", ["/large.jpg", "/large_unannounced.jpg"])
+def test_fetch_over_size_cap_is_rejected(stub_server, path):
+    with pytest.raises(ImageFetchError) as error:
+        fetch(f"{stub_server}{path}")
+    assert error.value.status_code == 413
+
+
+def test_fetch_timeout(stub_server):
+    with pytest.raises(ImageFetchError) as error:
+        fetch(f"{stub_server}/slow.jpg")
+    assert error.value.status_code == 504
+
+
+def test_fetch_error_status(stub_server):
+    with pytest.raises(ImageFetchError) as error:
+        fetch(f"{stub_server}/missing.jpg")
+    assert error.value.status_code == 400
@@ -0,0 +1,53 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("torch")
+
+from yolo.ultralytics.data.augment import LetterBox  # noqa: E402
+from yolo.ultralytics.data.preprocess import BufferPool, LetterBoxBatch  # noqa: E402
+
+
+def reference_batch(letterbox, images):
+    """ LetterBox per image, then the stacking, BGR to RGB, HWC to CHW and scaling of BasePredictor.preprocess """
+    batch = np.stack([letterbox(image=image) for image in images])
+    return np.ascontiguousarray(batch[..., ::-1].transpose(0, 3, 1, 2)).astype(np.float32) / 255
+
+
+@pytest.mark.parametrize("auto", [False, True])
+@pytest.mark.parametrize("image_shape", [(480, 640), (640, 480), (333, 517), (640, 640), (100, 120)])
+@pytest.mark.parametrize("batch_size", [1, 3])
+def test_letterbox_batch_matches_letterbox(auto, image_shape, batch_size):
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 256, size=(*image_shape, 3), dtype=np.uint8) for _ in range(batch_size)]
+    letterbox = LetterBox(320, auto=auto, stride=32)
+
+    batch = LetterBoxBatch(letterbox, max_workers=2)(images)
+    expected = reference_batch(letterbox, images)
+    assert tuple(batch.shape) == expected.shape
+    assert batch.shape[2:] == letterbox.padded_shape(image_shape)
+    np.testing.assert_allclose(batch.numpy(), expected, rtol=0, atol=1e-6)
+
+
+def test_released_buffer_is_reused():
+    pool = BufferPool()
+    letterbox_batch = LetterBoxBatch(LetterBox(64), pool=pool)
+    images = [np.zeros((64, 64, 3), dtype=np.uint8)]
+    first = letterbox_batch(images)
+    buffer = first.numpy()
+    letterbox_batch.release(first)
+    assert np.shares_memory(letterbox_batch(images).numpy(), buffer)
+
+
+@pytest.mark.parametrize("auto", [False, True])
+@pytest.mark.parametrize("image_shape", [(480, 640), (640, 480), (333, 517), (100, 120)])
+def test_padded_shape_matches_letterbox(auto, image_shape):
+    letterbox = LetterBox(320, auto=auto, stride=32)
+    image = np.zeros((*image_shape, 3), dtype=np.uint8)
+    assert letterbox.padded_shape(image_shape) == letterbox(image=image).shape[:2]
@@ -0,0 +1,76 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import json
+import logging
+import logging.handlers
+
+import pytest
+
+from src.utils_files import util
+
+
+@pytest.fixture
+def root_logger(monkeypatch, tmp_path):
+    """ Lets a test set up the root logger in a temporary directory and removes its handler afterwards """
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    level = root.level
+    yield root
+    util.shutdown_root_logger()
+    if util._QUEUE_HANDLER is not None:
+        root.removeHandler(util._QUEUE_HANDLER)
+    util._QUEUE_HANDLER = None
+    util._LOG_FILE = None
+    root.setLevel(level)
+
+
+def queue_handlers(root):
+    return [handler for handler in root.handlers if isinstance(handler, logging.handlers.QueueHandler)]
+
+
+def test_root_logger_is_only_set_up_once(root_logger, tmp_path):
+    log_file = util.setup_root_logger("service")
+    assert util.setup_root_logger("service") == log_file
+    assert log_file.startswith(str(tmp_path))
+    assert len(queue_handlers(root_logger)) == 1
+
+
+def test_records_are_tagged_with_the_request_id(root_logger):
+    log_file = util.setup_root_logger("service")
+    logger = logging.getLogger("test_logging_pipeline")
+    token = util.set_request_id("req-1")
+    try:
+        assert util.get_request_id() == "req-1"
+        logger.info("inside the request")
+    finally:
+        util.reset_request_id(token)
+    logger.info("outside the request")
+    util.shutdown_root_logger()  # flushes the queued records
+
+    with open(log_file) as file:
+        lines = file.read().splitlines()
+    assert any("[req-1] inside the request" in line for line in lines)
+    assert any("[-] outside the request" in line for line in lines)
+
+
+def test_stage_timings_are_logged_as_one_json_record(root_logger):
+    log_file = util.setup_root_logger("service", log_format="json")
+    timer = util.StageTimer("req-2")
+    for _ in range(2):
+        with timer.stage("decode"):
+            pass
+    with timer.stage("predict"):
+        pass
+    timer.log(logging.getLogger("test_logging_pipeline"))
+    util.shutdown_root_logger()
+
+    with open(log_file) as file:
+        entries = [json.loads(line) for line in file]
+    entry = next(entry for entry in entries if entry["message"].startswith("Request completed"))
+    assert entry["request_id"] == "req-2"
+    assert sorted(entry["stages_ms"]) == ["decode", "predict"]
+    assert entry["total_ms"] >= sum(entry["stages_ms"].values()) - 0.1
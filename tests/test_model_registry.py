@@ -0,0 +1,112 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import hashlib
+import os
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("torch")
+
+from service.region_detection_service import model_registry as registry_module  # noqa: E402
+from service.region_detection_service.model_registry import ModelRegistry  # noqa: E402
+from service.region_detection_service.object_detection_processor import RegionExtractor  # noqa: E402
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """ Replaces the model loading with a fake model and records every load """
+    loaded = []
+
+    def fake_load(weights_path, device, half, imgsz, backend="pytorch", intra_op_threads=0, inter_op_threads=0):
+        loaded.append((weights_path, backend))
+        return types.SimpleNamespace(names={56: "chair", 57: "couch"}, model=None)
+
+    monkeypatch.setattr(ModelRegistry, "_ModelRegistry__load_model", staticmethod(fake_load))
+    monkeypatch.setattr(registry_module, "_default_registry", None)
+    return loaded
+
+
+def test_extractors_without_registry_share_one_model(loads):
+    image_array = np.zeros((32, 32, 3), dtype=np.uint8)
+    first = RegionExtractor("first.jpg", image_array=image_array)
+    second = RegionExtractor("second.jpg", image_array=image_array)
+    assert first.yolo_model is second.yolo_model
+    assert first.model_registry is second.model_registry is registry_module.get_default_registry()
+    assert len(loads) == 1
+
+
+def test_extractor_with_label_ids_does_not_load_the_model(loads):
+    RegionExtractor("image.jpg", image_array=np.zeros((32, 32, 3), dtype=np.uint8), label_ids=[56])
+    assert loads == []
+
+
+class FakeYOLO:
+    """ Stands in for YOLO: exports next to the weights like ultralytics does and records every call """
+    created, exports = [], []
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        self.names = {56: "chair"}
+        self.model = None
+        FakeYOLO.created.append(model_path)
+
+    def export(self, format, imgsz, dynamic, half):
+        FakeYOLO.exports.append((self.model_path, format, imgsz))
+        stem = os.path.splitext(self.model_path)[0]
+        if format == "openvino":
+            os.makedirs(f"{stem}_openvino_model", exist_ok=True)
+            return f"{stem}_openvino_model{os.sep}"
+        with open(f"{stem}.onnx", "wb") as exported_file:
+            exported_file.write(b"onnx")
+        return f"{stem}.onnx"
+
+    def predict(self, **kwargs):
+        return []
+
+
+@pytest.fixture
+def fake_yolo(monkeypatch, tmp_path):
+    monkeypatch.setattr(registry_module, "YOLO", FakeYOLO)
+    monkeypatch.setattr(FakeYOLO, "created", [])
+    monkeypatch.setattr(FakeYOLO, "exports", [])
+    weights_path = tmp_path / "yolov8n.pt"
+    weights_path.write_bytes(b"checkpoint v1")
+    return weights_path
+
+
+def exported_model(weights_path, backend, imgsz):
+    return ModelRegistry._ModelRegistry__exported_model(str(weights_path), backend, imgsz)
+
+
+@pytest.mark.parametrize("backend, suffix", [("onnx", ".onnx"), ("openvino", "_openvino_model")])
+def test_export_is_named_after_weights_hash_and_imgsz(fake_yolo, backend, suffix):
+    digest = hashlib.sha256(b"checkpoint v1").hexdigest()[:12]
+    artifact_path = exported_model(fake_yolo, backend, 320)
+    assert artifact_path == str(fake_yolo.parent / f"yolov8n_{digest}_320{suffix}")
+    assert os.path.exists(artifact_path)
+
+    # Cached: the same weights and imgsz are not exported again
+    assert exported_model(fake_yolo, backend, 320) == artifact_path
+    assert len(FakeYOLO.exports) == 1
+    # Another image size or checkpoint gets its own export
+    assert exported_model(fake_yolo, backend, 640) != artifact_path
+    fake_yolo.write_bytes(b"checkpoint v2")
+    assert exported_model(fake_yolo, backend, 320) != artifact_path
+    assert len(FakeYOLO.exports) == 3
+
+
+def test_backend_selects_the_served_model(fake_yolo):
+    model_registry = ModelRegistry(models_dir=str(fake_yolo.parent))
+    model_registry.get_model("yolov8n.pt", backend="pytorch")
+    model_registry.get_model("yolov8n.pt", backend="onnx")
+    assert FakeYOLO.created[0] == str(fake_yolo)
+    assert FakeYOLO.created[-1].endswith("_640.onnx")
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        model_registry.get_model("yolov8n.pt", backend="tensorrt")
@@ -0,0 +1,61 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+torch = pytest.importorskip("torch")
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from yolo.ultralytics import YOLO  # noqa: E402
+from yolo.ultralytics.nn.autobackend import ORT_OUTPUT_BUFFERS  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def onnx_model(tmp_path_factory):
+    """ An ONNX export of untrained weights with a dynamic batch, so no download is needed """
+    # A model built from its yaml is exported to the working directory
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("weights"))
+    try:
+        return YOLO(os.path.abspath(YOLO("yolov8n.yaml").export(format="onnx", imgsz=64, dynamic=True)))
+    finally:
+        os.chdir(cwd)
+
+
+def images(seed):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, size=(64, 64, 3), dtype=np.uint8) for _ in range(2)]
+
+
+def test_predict_array_results_outlive_the_next_batch(onnx_model):
+    onnx_model.predict_array(images(0), imgsz=64, conf=0.0)  # the first call of a shape learns its output shapes
+    first = onnx_model.predict_array(images(1), imgsz=64, conf=0.0)
+    first_boxes = [result.boxes.data.clone() for result in first]
+    second = onnx_model.predict_array(images(2), imgsz=64, conf=0.0)
+    # Both batches went through the same bound output tensors
+    assert len(onnx_model.predictor.model.ort_outputs) == 1
+    for result, boxes in zip(first, first_boxes):
+        assert torch.equal(result.boxes.data, boxes)
+    assert not all(torch.equal(a.boxes.data, b.boxes.data) for a, b in zip(first, second))
+
+
+def test_output_ring_keeps_the_outputs_of_the_last_calls(onnx_model):
+    onnx_model.predict_array(images(0), imgsz=64, conf=0.0)
+    backend = onnx_model.predictor.model
+    backend.output_buffers = ORT_OUTPUT_BUFFERS
+    batches = [torch.rand(2, 3, 64, 64, generator=torch.Generator().manual_seed(seed)) for seed in range(3)]
+    backend(batches[0])  # the ring of this shape is only used once its output shapes are known
+    outputs = [backend(im) for im in batches[1:]]
+    expected = [backend(im) for im in batches[1:]]
+    # The outputs of a call are still intact after the next one, which wrote to another ring slot
+    for y, y_expected in zip(outputs, expected):
+        y, y_expected = (x[0] if isinstance(x, (list, tuple)) else x for x in (y, y_expected))
+        assert torch.equal(y, y_expected)
@@ -0,0 +1,42 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+torch = pytest.importorskip("torch")
+
+from yolo.ultralytics import YOLO  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def images():
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, size=shape, dtype=np.uint8) for shape in [(64, 96, 3), (64, 96, 3), (48, 64, 3)]]
+
+
+def test_predict_array_matches_predict(images):
+    model = YOLO("yolov8n.yaml")  # untrained weights, no download
+    expected = model.predict(source=images, imgsz=64, conf=0.0, verbose=False)
+    results = model.predict_array(images, imgsz=64, conf=0.0)
+    assert len(results) == len(images)
+    for result, reference in zip(results, expected):
+        assert result.orig_shape == reference.orig_shape
+        assert result.names == reference.names
+        assert torch.allclose(result.boxes.data, reference.boxes.data, atol=1e-4)
+
+
+def test_predict_array_follows_changed_args(images):
+    model = YOLO("yolov8n.yaml")
+    everything = model.predict_array(images[0], imgsz=64, conf=0.0)[0]
+    confident = model.predict_array(images[0], imgsz=64, conf=1.0)[0]
+    assert len(confident.boxes) == 0
+    assert len(everything.boxes) > 0
+    # Calls with the same args reuse the predictor without resolving them again
+    args = model.predictor.args
+    model.predict_array(images[0], imgsz=64, conf=1.0)
+    assert model.predictor.args is args
@@ -0,0 +1,46 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("torch")
+
+from yolo.ultralytics import YOLO  # noqa: E402
+
+FRAMES = 12
+
+
+@pytest.fixture(scope="module")
+def video_path(tmp_path_factory):
+    """ A short video whose frames all differ, so every frame gets its own labels """
+    path = tmp_path_factory.mktemp("video") / "v.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (96, 64))
+    rng = np.random.default_rng(0)
+    for _ in range(FRAMES):
+        writer.write(rng.integers(0, 256, size=(64, 96, 3), dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def saved_labels(model, video_path, project, pipeline):
+    """ Runs the predictor over the video with save_txt and returns {label file name: number of labels} """
+    for _ in model.predict(source=str(video_path), imgsz=64, conf=0.0, save_txt=True, project=str(project),
+                           name="pipelined" if pipeline else "sequential", pipeline=pipeline, stream=True,
+                           verbose=False):
+        pass
+    labels_dir = project / ("pipelined" if pipeline else "sequential") / "labels"
+    return {path.name: len(path.read_text().splitlines()) for path in sorted(labels_dir.glob("*.txt"))}
+
+
+def test_pipelined_predictions_are_written_under_their_own_frame(video_path, tmp_path):
+    model = YOLO("yolov8n.yaml")  # untrained weights, no download
+    sequential = saved_labels(model, video_path, tmp_path, pipeline=False)
+    pipelined = saved_labels(model, video_path, tmp_path, pipeline=True)
+    assert sorted(sequential) == sorted(f"v_{frame}.txt" for frame in range(1, FRAMES + 1))
+    # Frames written under a later frame's name would be appended to its file
+    assert pipelined == sequential
@@ -0,0 +1,48 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+torch = pytest.importorskip("torch")
+
+from yolo.ultralytics import YOLO  # noqa: E402
+from yolo.ultralytics.engine.predictor_pool import PredictorPool, clone_module  # noqa: E402
+
+
+def test_clone_shares_the_weights_but_not_the_modules():
+    model = torch.nn.Sequential(torch.nn.Conv2d(3, 4, 3), torch.nn.BatchNorm2d(4)).eval()
+    clone = clone_module(model)
+    assert clone is not model and clone[0] is not model[0]
+    assert clone[0].weight is model[0].weight
+    assert clone[1].running_mean is model[1].running_mean
+    im = torch.rand(1, 3, 8, 8)
+    assert torch.equal(clone(im), model(im))
+    # Attributes set on a cloned submodule stay local to it
+    clone[0].cache = "clone"
+    assert not hasattr(model[0], "cache")
+
+
+def test_pool_predictors_share_the_weights_and_run_in_parallel():
+    model = YOLO("yolov8n.yaml")  # untrained weights, no download
+    pool = PredictorPool(model, size=2, imgsz=64, conf=0.0, verbose=False)
+    first, second = (predictor.model.model for predictor in pool.predictors)
+    assert first is not second
+    assert all(a is b for a, b in zip(first.parameters(), second.parameters()))
+
+    # Both predictors can be borrowed at the same time
+    with pool.acquire() as borrowed, pool.acquire() as other:
+        assert borrowed is not other
+
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 256, size=(64, 64, 3), dtype=np.uint8) for _ in range(8)]
+    expected = [pool.predict_array(image)[0].boxes.data for image in images]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda image: pool.predict_array(image)[0].boxes.data, images))
+    assert all(torch.equal(a, b) for a, b in zip(results, expected))
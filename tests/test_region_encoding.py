@@ -0,0 +1,42 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import numpy as np
+import orjson
+
+from service.region_detection_service.region_encoding import columns_from_boxes
+
+
+class FakeBoxes:
+    """Stands in for ultralytics Boxes, whose data tensor is moved to numpy with .cpu().numpy()"""
+
+    def __init__(self, data):
+        self.data = self
+        self._data = np.asarray(data, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._data
+
+
+NAMES = {0: "person", 1: "chair", 2: "couch"}
+
+
+def test_confidence_is_rounded_without_float32_noise():
+    columns = columns_from_boxes(FakeBoxes([[1, 2, 3, 4, 0.8299, 1]]), NAMES)
+    assert columns["confidence"] == [0.83]
+    assert b'"confidence":[0.83]' in orjson.dumps(columns)
+
+
+def test_class_ids_are_floats_and_filtered():
+    boxes = FakeBoxes([[1, 2, 3, 4, 0.5, 1], [5, 6, 7, 8, 0.9, 0], [9, 10, 11, 12, 0.7, 2]])
+    columns = columns_from_boxes(boxes, NAMES, class_ids=[1, 2])
+    assert columns["class_id"] == [1.0, 2.0]
+    assert all(isinstance(class_id, float) for class_id in columns["class_id"])
+    assert columns["class_name"] == ["chair", "couch"]
+    assert columns["xmin"] == [1, 9]
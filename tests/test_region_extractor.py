@@ -0,0 +1,58 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("torch")
+
+from service.region_detection_service.object_detection_processor import RegionExtractor  # noqa: E402
+
+NAMES = {56: "chair", 57: "couch"}
+
+
+class FakeBoxes:
+    """Stands in for ultralytics Boxes, whose data tensor is moved to numpy with .cpu().numpy()"""
+
+    def __init__(self, data):
+        self.data = self
+        self._data = np.asarray(data, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._data
+
+
+def extractor():
+    return RegionExtractor("image.jpg", image_array=np.zeros((32, 32, 3), dtype=np.uint8), label_ids=[56, 57])
+
+
+def fake_result(rows):
+    return types.SimpleNamespace(boxes=FakeBoxes(rows), names=NAMES, masks=None)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_successful_extraction_has_no_error(columnar):
+    region_extractor = extractor()
+    regions, merged = region_extractor.extract_regions(fake_result([[0, 0, 10, 10, 0.9, 56], [5, 5, 20, 20, 0.8, 57]]),
+                                                       render_images=False, columnar=columnar)
+    assert region_extractor.error is None
+    assert len(merged["xmin"] if columnar else merged) == 1
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_failed_extraction_is_flagged(columnar):
+    region_extractor = extractor()
+    # Results without boxes make the region identification fail
+    regions, merged = region_extractor.extract_regions(types.SimpleNamespace(names=NAMES, masks=None),
+                                                       render_images=False, columnar=columnar)
+    assert not regions and not merged
+    assert isinstance(region_extractor.error, AttributeError)
@@ -0,0 +1,32 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("torch")
+
+from service.region_detection_service.region_masks import decode_rle, encode_rle  # noqa: E402
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (7, 5), (32, 48)])
+@pytest.mark.parametrize("seed", range(3))
+def test_rle_round_trip(shape, seed):
+    mask = (np.random.default_rng(seed).random(shape) > 0.6).astype(np.uint8)
+    rle = encode_rle(mask)
+    assert rle["size"] == list(shape)
+    assert sum(rle["counts"]) == mask.size
+    np.testing.assert_array_equal(decode_rle(rle), mask)
+
+
+def test_rle_is_column_major_and_starts_with_background():
+    mask = np.array([[1, 0],
+                     [1, 1]], dtype=np.uint8)
+    # Column-major pixels 1, 1, 0, 1: an empty leading run of zeros
+    assert encode_rle(mask)["counts"] == [0, 2, 1, 1]
+    assert encode_rle(np.zeros((2, 3), dtype=np.uint8))["counts"] == [6]
+    assert encode_rle(np.ones((2, 3), dtype=np.uint8))["counts"] == [0, 6]
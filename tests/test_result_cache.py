@@ -0,0 +1,34 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+
+from service.region_detection_service.result_cache import ResultCache
+
+
+def test_disk_tier_is_written_in_the_background_and_read_off_the_loop(tmp_path):
+    key = ResultCache.make_key(b"image", "yolov8n.pt", 0.2, ["chair"], variant="rows|merge=intersect,0.0")
+    value = ([{"xmin": 1, "class_name": "chair"}], [{"xmin": 1}])
+    writer = ResultCache(disk_path=str(tmp_path))
+    writer.put(key, value)
+    writer.close()
+    assert (tmp_path / f"{key}.json").exists()
+
+    reader = ResultCache(disk_path=str(tmp_path))
+    assert asyncio.run(reader.lookup(key)) == value
+    assert reader.disk_hits == 1
+    # Promoted to the memory tier
+    assert asyncio.run(reader.lookup(key)) == value
+    assert reader.stats()["hits"] == 2
+    assert asyncio.run(reader.lookup("missing")) is None
+    assert reader.misses == 1
+    reader.close()
+
+
+def test_merge_settings_change_the_key():
+    intersect = ResultCache.make_key(b"image", "yolov8n.pt", 0.2, ["chair"], variant="rows|merge=intersect,0.0")
+    iou = ResultCache.make_key(b"image", "yolov8n.pt", 0.2, ["chair"], variant="rows|merge=iou,0.5")
+    assert intersect != iou
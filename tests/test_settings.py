@@ -0,0 +1,123 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.utils_files import settings as app_settings
+from src.utils_files.settings import Settings, load_settings
+
+CONFIG = """
+[YOLO]
+MODEL = yolov8s.pt
+HALF = yes
+IMGSZ = 320
+CONFIDENCE = 0.35
+LABELS = [chair, couch, dining table]
+
+[SERVER_CONFIG]
+PORT = 9000
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.ini"
+    path.write_text(CONFIG)
+    return path
+
+
+def test_config_values_are_typed(config_path):
+    settings = load_settings(str(config_path), environ={})
+    assert settings.yolo.model == "yolov8s.pt"
+    assert settings.yolo.half is True
+    assert settings.yolo.imgsz == 320
+    assert settings.yolo.confidence == 0.35
+    assert settings.yolo.labels == ("chair", "couch", "dining table")
+    assert settings.server.port == 9000
+    # Keys missing from the file keep their defaults
+    assert settings.server.pool_size == Settings().server.pool_size
+
+
+def test_environment_overrides_the_config(config_path):
+    environ = {"REGION_YOLO_IMGSZ": "640", "REGION_YOLO_HALF": "false", "REGION_SERVER_CONFIG_POOL_SIZE": "8",
+               "REGION_YOLO_LABELS": "bed", "REGION_CACHE_TTL_SECONDS": "60"}
+    settings = load_settings(str(config_path), environ=environ)
+    assert settings.yolo.imgsz == 640
+    assert settings.yolo.half is False
+    assert settings.server.pool_size == 8
+    assert settings.yolo.labels == ("bed",)
+    assert settings.cache.ttl_seconds == 60.0 and isinstance(settings.cache.ttl_seconds, float)
+    assert settings.yolo.model == "yolov8s.pt"
+
+
+@pytest.mark.parametrize("key, value", [("REGION_YOLO_IMGSZ", "large"), ("REGION_YOLO_HALF", "maybe")])
+def test_invalid_values_are_rejected(config_path, key, value):
+    with pytest.raises(ValueError, match="Invalid value"):
+        load_settings(str(config_path), environ={key: value})
+
+
+def test_missing_config_file_uses_defaults(tmp_path):
+    assert load_settings(str(tmp_path / "missing.ini"), environ={}) == Settings()
+
+
+@pytest.fixture
+def reloadable(config_path, monkeypatch):
+    """ Loads the settings from the test config, with its own list of reload callbacks """
+    monkeypatch.setenv(app_settings.CONFIG_PATH_ENV, str(config_path))
+    monkeypatch.setattr(app_settings, "_settings", None)
+    monkeypatch.setattr(app_settings, "_reload_callbacks", [])
+    return config_path
+
+
+def test_reload_swaps_the_settings_and_calls_back(reloadable):
+    old_settings = app_settings.get_settings()
+    calls = []
+    app_settings.on_reload(lambda old, new: calls.append((old, new)))
+
+    # Unchanged configuration: no callback
+    assert app_settings.reload_settings() is old_settings
+    assert calls == []
+
+    reloadable.write_text(CONFIG.replace("IMGSZ = 320", "IMGSZ = 416"))
+    new_settings = app_settings.reload_settings()
+    assert new_settings.yolo.imgsz == 416
+    assert app_settings.get_settings() is new_settings
+    assert calls == [(old_settings, new_settings)]
+
+
+def test_failed_reload_keeps_the_running_settings(reloadable):
+    old_settings = app_settings.get_settings()
+
+    def reject(old, new):
+        raise RuntimeError("model failed to load")
+
+    app_settings.on_reload(reject)
+    reloadable.write_text(CONFIG.replace("IMGSZ = 320", "IMGSZ = 416"))
+    assert app_settings.reload_settings() is old_settings
+    assert app_settings.get_settings() is old_settings
+
+    # An invalid file is rejected as well
+    reloadable.write_text(CONFIG.replace("IMGSZ = 320", "IMGSZ = large"))
+    assert app_settings.reload_settings() is old_settings
+
+
+def test_reload_signal_outside_the_main_thread_is_skipped():
+    installed = []
+
+    def run_loop():
+        loop = asyncio.new_event_loop()
+        try:
+            installed.append(app_settings.install_reload_signal(loop))
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=run_loop)
+    thread.start()
+    thread.join()
+    assert installed == [False]
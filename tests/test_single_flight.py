@@ -0,0 +1,61 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+
+import pytest
+
+from service.region_detection_service.single_flight import SingleFlight
+
+
+def test_concurrent_identical_keys_share_one_computation():
+    calls = []
+
+    async def compute(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return f"regions of {key}"
+
+    async def scenario():
+        single_flight = SingleFlight()
+        results = await asyncio.gather(*(single_flight.run(key, compute, key) for key in ["a", "a", "b", "a"]))
+        # Finished computations are forgotten, the next request computes again
+        assert "a" not in single_flight
+        assert await single_flight.run("a", compute, "a") == "regions of a"
+        return results
+
+    assert asyncio.run(scenario()) == ["regions of a", "regions of a", "regions of b", "regions of a"]
+    assert calls == ["a", "b", "a"]
+
+
+def test_waiters_share_the_exception_of_the_computation():
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("download failed")
+
+    async def scenario():
+        single_flight = SingleFlight()
+        return await asyncio.gather(*(single_flight.run("a", compute) for _ in range(3)), return_exceptions=True)
+
+    assert [type(error) for error in asyncio.run(scenario())] == [ValueError] * 3
+
+
+def test_cancelled_caller_does_not_cancel_the_computation():
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "regions"
+
+    async def scenario():
+        single_flight = SingleFlight()
+        first = asyncio.ensure_future(single_flight.run("a", compute))
+        second = asyncio.ensure_future(single_flight.run("a", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "regions"
@@ -0,0 +1,68 @@
+"""==========================================
+ Title:  Assignment - Python - ObjectDetection
+ Author: Hussain Masthan
+ Date:   Jan - 2024
+=========================================="""
+
+import asyncio
+import threading
+
+import pytest
+
+from service.region_detection_service.batch_scheduler import BatchScheduler
+from service.region_detection_service.worker_pool import InferenceWorkerPool, PoolSaturatedError
+
+
+def test_timed_out_call_keeps_its_slot_until_it_finishes():
+    async def scenario():
+        worker_pool = InferenceWorkerPool(pool_size=1, queue_depth=0, timeout=0.05)
+        release = threading.Event()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await worker_pool.run(release.wait)
+            # The worker is still busy with the timed out call
+            assert worker_pool.pending == 1
+            with pytest.raises(PoolSaturatedError):
+                await worker_pool.run(lambda: None)
+
+            release.set()
+            for _ in range(100):
+                if worker_pool.pending == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert worker_pool.pending == 0
+            assert await worker_pool.run(lambda: 42) == 42
+        finally:
+            release.set()
+            worker_pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_batch_predictions_count_as_pending_calls():
+    async def scenario():
+        worker_pool = InferenceWorkerPool(pool_size=1, queue_depth=0, timeout=1)
+        release = threading.Event()
+
+        def predict(image_arrays):
+            release.wait()
+            return [image_array * 2 for image_array in image_arrays]
+
+        scheduler = BatchScheduler(predict, max_batch_size=4, max_wait_ms=0, worker_pool=worker_pool)
+        await scheduler.start()
+        try:
+            submitted = asyncio.ensure_future(scheduler.submit(3))
+            for _ in range(100):
+                if worker_pool.pending:
+                    break
+                await asyncio.sleep(0.01)
+            with pytest.raises(PoolSaturatedError):
+                await worker_pool.run(lambda: None)
+            release.set()
+            assert await submitted == 6
+        finally:
+            release.set()
+            await scheduler.stop()
+            worker_pool.shutdown()
+
+    asyncio.run(scenario())
@@ -689,6 +689,20 @@ class LetterBox:
         self.stride = stride
         self.center = center  # Put the image in the middle or top-left
 
+    def padded_shape(self, shape):
+        """Return the (height, width) an image of the given (height, width) is letterboxed to."""
+        new_shape = (self.new_shape, self.new_shape) if isinstance(self.new_shape, int) else self.new_shape
+        r = min(new_shape[0] / shape[0], new_shape[1] / shape[1])
+        if not self.scaleup:
+            r = min(r, 1.0)
+        if self.scaleFill:
+            return tuple(new_shape)
+        new_unpad = int(round(shape[0] * r)), int(round(shape[1] * r))
+        if self.auto:  # minimum rectangle
+            return (new_unpad[0] + int(np.mod(new_shape[0] - new_unpad[0], self.stride)),
+                    new_unpad[1] + int(np.mod(new_shape[1] - new_unpad[1], self.stride)))
+        return tuple(new_shape)
+
     def __call__(self, labels=None, image=None):
         """Return updated labels and image with added border."""
         if labels is None:
@@ -0,0 +1,135 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import torch
+
+PAD_VALUE = 114  # letterbox border colour, same as LetterBox
+
+
+class BufferPool:
+    """
+    Pool of reusable numpy buffers, keyed by shape and dtype.
+
+    Buffers are handed out by `acquire()` and only reused once they are given back with `release()`, so a buffer that
+    is still referenced by an in-flight batch is never overwritten.
+    """
+
+    def __init__(self, max_per_key=4):
+        """Initialize the pool, keeping at most `max_per_key` idle buffers of each shape and dtype."""
+        self.max_per_key = max_per_key
+        self._free = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, shape, dtype=np.float32):
+        """Return an idle buffer of the given shape and dtype, allocating a new one if none is available."""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, buffer):
+        """Return a buffer to the pool so later batches of the same shape can reuse it."""
+        key = (buffer.shape, buffer.dtype.str)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_per_key:
+                free.append(buffer)
+
+    def clear(self):
+        """Drop every idle buffer."""
+        with self._lock:
+            self._free.clear()
+
+
+class LetterBoxBatch:
+    """
+    Fused letterbox + normalization of a batch of BGR images into one BCHW float tensor.
+
+    Each image is resized once and written straight into its padded offset of a pooled (n, 3, h, w) buffer, with the
+    BGR to RGB swap, HWC to CHW transpose and 0-255 to 0.0-1.0 scaling done in that same write. Only the border strips
+    are filled with the padding colour. Images are processed on a thread pool (cv2 and numpy release the GIL).
+
+    Equivalent to stacking `LetterBox(image=x)` for every image followed by the flip, transpose, contiguous copy,
+    `torch.from_numpy` and division by 255 of `BasePredictor.preprocess`, without the intermediate full-batch copies.
+    """
+
+    def __init__(self, letterbox, pool=None, max_workers=None):
+        """
+        Args:
+            letterbox (LetterBox): letterbox settings to apply.
+            pool (BufferPool, optional): pool the batch buffers are taken from. Defaults to a private pool.
+            max_workers (int, optional): threads used for batches of several images. Defaults to the CPU count (<= 8).
+        """
+        self.letterbox = letterbox
+        self.pool = pool or BufferPool()
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._executor = None
+        self._executor_pid = None
+
+    def __call__(self, images):
+        """
+        Letterbox and normalize a list of HWC BGR uint8 images.
+
+        All images must be letterboxed to the same shape, i.e. `letterbox.padded_shape()` is equal for all of them.
+
+        Returns:
+            (torch.Tensor): float32 (n, 3, h, w) RGB tensor in 0.0-1.0, backed by a pooled buffer. Give it back with
+                `release()` once the batch has been consumed.
+        """
+        height, width = self.letterbox.padded_shape(images[0].shape[:2])
+        batch = self.pool.acquire((len(images), 3, height, width), np.float32)
+        if len(images) > 1 and self.max_workers > 1:
+            if self._executor is None or self._executor_pid != os.getpid():  # threads don't survive a fork
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='letterbox')
+                self._executor_pid = os.getpid()
+            list(self._executor.map(self._write_image, images, batch))
+        else:
+            for image, out in zip(images, batch):
+                self._write_image(image, out)
+        return torch.from_numpy(batch)
+
+    def release(self, tensor):
+        """Give the buffer behind a tensor returned by `__call__` back to the pool."""
+        self.pool.release(tensor.numpy())
+
+    def _write_image(self, image, out):
+        """Resize one image and write it normalized into its (3, h, w) slot of the batch buffer."""
+        height, width = out.shape[1:]
+        shape = image.shape[:2]
+        new_shape = self.letterbox.new_shape
+        if isinstance(new_shape, int):
+            new_shape = (new_shape, new_shape)
+        r = min(new_shape[0] / shape[0], new_shape[1] / shape[1])
+        if not self.letterbox.scaleup:
+            r = min(r, 1.0)
+        new_unpad = int(round(shape[1] * r)), int(round(shape[0] * r))
+        if self.letterbox.scaleFill:  # stretch
+            new_unpad = width, height
+        dw, dh = width - new_unpad[0], height - new_unpad[1]
+        if self.letterbox.center:
+            dw /= 2
+            dh /= 2
+        top = int(round(dh - 0.1)) if self.letterbox.center else 0
+        left = int(round(dw - 0.1)) if self.letterbox.center else 0
+        bottom, right = top + new_unpad[1], left + new_unpad[0]
+
+        if shape[::-1] != new_unpad:
+            image = cv2.resize(image, new_unpad, interpolation=cv2.INTER_LINEAR)
+
+        # BGR -> RGB, HWC -> CHW, uint8 -> float and /255 in a single write into the padded offset
+        np.multiply(image[..., ::-1].transpose(2, 0, 1), 1 / 255, out=out[:, top:bottom, left:right],
+                    casting='unsafe')
+
+        # Only the border strips are padded
+        pad = PAD_VALUE / 255
+        out[:, :top].fill(pad)
+        out[:, bottom:].fill(pad)
+        out[:, top:bottom, :left].fill(pad)
+        out[:, top:bottom, right:].fill(pad)
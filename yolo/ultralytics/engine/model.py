@@ -256,6 +256,28 @@ class Model(nn.Module):
             self.predictor.set_prompts(prompts)
         return self.predictor.predict_cli(source=source) if is_cli else self.predictor(source=source, stream=stream)
 
+    def predict_array(self, source, **kwargs):
+        """
+        Low-overhead prediction on in-memory images, see `BasePredictor.predict_array()`.
+
+        The predictor is created by the first call. Later calls only merge `kwargs` into the predictor args when they
+        change them, so repeated calls with the same settings skip the argument resolution of `predict()`.
+
+        Args:
+            source (np.ndarray | List(np.ndarray)): An HWC BGR image or a list of them, predicted as one batch.
+            **kwargs : Additional keyword arguments passed to the predictor.
+
+        Returns:
+            (List[ultralytics.engine.results.Results]): One Results per image.
+        """
+        if not self.predictor:
+            args = {**self.overrides, 'conf': 0.25, 'save': False, **kwargs, 'mode': 'predict'}
+            self.predictor = self._smart_load('predictor')(overrides=args, _callbacks=self.callbacks)
+            self.predictor.setup_model(model=self.model, verbose=False)
+        else:
+            self.predictor.update_args(kwargs)
+        return self.predictor.predict_array(source)
+
     def track(self, source=None, stream=False, persist=False, **kwargs):
         """
         Perform object tracking on the input source using the registered trackers.
@@ -390,8 +412,10 @@ class Model(nn.Module):
 
     @property
     def names(self):
-        """Returns class names of the loaded model."""
-        return self.model.names if hasattr(self.model, 'names') else None
+        """Returns class names of the loaded model, or of the predictor backend for exported formats."""
+        if hasattr(self.model, 'names'):
+            return self.model.names
+        return self.predictor.model.names if self.predictor and hasattr(self.predictor.model, 'names') else None
 
     @property
     def device(self):
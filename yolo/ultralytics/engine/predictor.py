@@ -28,6 +28,7 @@ Usage - formats:
                               yolov8n_paddle_model       # PaddlePaddle
 """
 import platform
+import queue
 import threading
 from pathlib import Path
 
@@ -38,11 +39,13 @@ import torch
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data import load_inference_source
 from ultralytics.data.augment import LetterBox, classify_transforms
-from ultralytics.nn.autobackend import AutoBackend
+from ultralytics.data.loaders import SourceTypes
+from ultralytics.data.preprocess import LetterBoxBatch
+from ultralytics.nn.autobackend import ORT_OUTPUT_BUFFERS, AutoBackend
 from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
 from ultralytics.utils.checks import check_imgsz, check_imshow
 from ultralytics.utils.files import increment_path
-from ultralytics.utils.torch_utils import select_device, smart_inference_mode
+from ultralytics.utils.torch_utils import TORCH_1_9, select_device, smart_inference_mode
 
 STREAM_WARNING = """
 WARNING ⚠️ inference results will accumulate in RAM unless `stream=True` is passed, causing potential out-of-memory
@@ -56,6 +59,8 @@ Example:
         probs = r.probs  # Class probabilities for classification outputs
 """
 
+PIPELINE_DEPTH = 2  # batches buffered between two stages of the pipelined stream_inference
+
 
 class BasePredictor:
     """
@@ -107,6 +112,10 @@ class BasePredictor:
         self.transforms = None
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
         self.txt_path = None
+        self.dataset_state = None  # (frame, count, mode) of the dataset when the batch being written was loaded
+        self.letterbox_batch = None  # fused letterbox + normalization into pooled buffers
+        self.array_args = None  # args imgsz and transforms were last resolved for by predict_array()
+        self._batch_buffer = None  # pooled tensor of the last preprocessed batch, taken over by stream_inference
         self._lock = threading.Lock()  # for automatic thread-safe inference
         callbacks.add_integration_callbacks(self)
 
@@ -117,6 +126,12 @@ class BasePredictor:
         Args:
             im (torch.Tensor | List(np.ndarray)): BCHW for tensor, [(HWC) x B] for list.
         """
+        if self.can_fuse_preprocess(im):
+            im = self.letterbox_batch(im)  # letterboxed, RGB, BCHW, float32 0.0 - 1.0 in one pass
+            self._batch_buffer = im
+            im = im.to(self.device)
+            return im.half() if self.model.fp16 else im
+
         not_tensor = not isinstance(im, torch.Tensor)
         if not_tensor:
             im = np.stack(self.pre_transform(im))
@@ -146,23 +161,67 @@ class BasePredictor:
         Returns:
             (list): A list of transformed images.
         """
-        same_shapes = all(x.shape == im[0].shape for x in im)
-        letterbox = LetterBox(self.imgsz, auto=same_shapes and self.model.pt, stride=self.model.stride)
+        letterbox = self.batch_letterbox(im)
         return [letterbox(image=x) for x in im]
 
+    def batch_letterbox(self, im):
+        """
+        Returns the LetterBox applied to a batch of images.
+
+        Uses minimum rectangles (auto) when every image of the batch letterboxes to the same shape.
+
+        Args:
+            im (List(np.ndarray)): [(h, w, 3) x N] images of the batch.
+
+        Returns:
+            (LetterBox): The letterbox transform for the batch.
+        """
+        same_shapes = all(x.shape == im[0].shape for x in im)
+        letterbox = LetterBox(self.imgsz, auto=self.model.pt, stride=self.model.stride)
+        if not same_shapes and self.model.pt:
+            # Images of different sizes still share the minimum rectangle when it is the same for all of them
+            same_shapes = len({letterbox.padded_shape(x.shape[:2]) for x in im}) == 1
+        letterbox.auto = same_shapes and self.model.pt
+        return letterbox
+
+    def can_fuse_preprocess(self, im):
+        """
+        Whether a batch can take the fused letterbox + normalization path of `preprocess`.
+
+        Only lists of 3-channel uint8 images are fused, and only while `pre_transform` is the plain letterbox of this
+        class, so subclasses with their own transforms keep the generic path.
+        """
+        if isinstance(im, torch.Tensor) or type(self).pre_transform is not BasePredictor.pre_transform:
+            return False
+        if not all(isinstance(x, np.ndarray) and x.dtype == np.uint8 and x.ndim == 3 and x.shape[2] == 3 for x in im):
+            return False
+        if self.letterbox_batch is None:
+            self.letterbox_batch = LetterBoxBatch(None)
+        self.letterbox_batch.letterbox = self.batch_letterbox(im)
+        return True
+
+    def release_batch(self, buffer):
+        """Give the pooled buffer of a batch (None if it was not preprocessed into one) back to the pool."""
+        if buffer is not None:
+            self.letterbox_batch.release(buffer)
+
+    def get_dataset_state(self):
+        """Return the (frame, count, mode) position of the dataset, i.e. of the batch it has loaded last."""
+        return getattr(self.dataset, 'frame', 0), getattr(self.dataset, 'count', 0), self.dataset.mode
+
     def write_results(self, idx, results, batch):
         """Write inference results to a file or directory."""
         p, im, _ = batch
         log_string = ''
         if len(im.shape) == 3:
             im = im[None]  # expand for batch dim
+        # Position of the dataset when this batch was loaded, the pipelined dataset has moved ahead since
+        frame, count, mode = self.dataset_state or self.get_dataset_state()
         if self.source_type.webcam or self.source_type.from_img or self.source_type.tensor:  # batch_size >= 1
             log_string += f'{idx}: '
-            frame = self.dataset.count
-        else:
-            frame = getattr(self.dataset, 'frame', 0)
+            frame = count
         self.data_path = p
-        self.txt_path = str(self.save_dir / 'labels' / p.stem) + ('' if self.dataset.mode == 'image' else f'_{frame}')
+        self.txt_path = str(self.save_dir / 'labels' / p.stem) + ('' if mode == 'image' else f'_{frame}')
         log_string += '%gx%g ' % im.shape[2:]  # print string
         result = results[idx]
         log_string += result.verbose()
@@ -181,7 +240,7 @@ class BasePredictor:
             result.save_txt(f'{self.txt_path}.txt', save_conf=self.args.save_conf)
         if self.args.save_crop:
             result.save_crop(save_dir=self.save_dir / 'crops',
-                             file_name=self.data_path.stem + ('' if self.dataset.mode == 'image' else f'_{frame}'))
+                             file_name=self.data_path.stem + ('' if mode == 'image' else f'_{frame}'))
 
         return log_string
 
@@ -209,9 +268,7 @@ class BasePredictor:
 
     def setup_source(self, source):
         """Sets up source and inference mode."""
-        self.imgsz = check_imgsz(self.args.imgsz, stride=self.model.stride, min_dim=2)  # check image size
-        self.transforms = getattr(self.model.model, 'transforms', classify_transforms(
-            self.imgsz[0])) if self.args.task == 'classify' else None
+        self.setup_transforms()
         self.dataset = load_inference_source(source=source,
                                              imgsz=self.imgsz,
                                              vid_stride=self.args.vid_stride,
@@ -225,6 +282,62 @@ class BasePredictor:
         self.vid_writer = [None] * self.dataset.bs
         self.vid_frame = [None] * self.dataset.bs
 
+    def setup_transforms(self):
+        """Resolves the image size and, for classification, the transforms from the current args."""
+        self.imgsz = check_imgsz(self.args.imgsz, stride=self.model.stride, min_dim=2)  # check image size
+        self.transforms = getattr(self.model.model, 'transforms', classify_transforms(
+            self.imgsz[0])) if self.args.task == 'classify' else None
+
+    def update_args(self, overrides):
+        """Merges predict arguments into the args, skipping the merge when they already hold these values."""
+        if any(getattr(self.args, k, None) != v for k, v in overrides.items()):
+            self.args = get_cfg(self.args, overrides)
+
+    @smart_inference_mode()
+    def predict_array(self, im):
+        """
+        Low-overhead prediction on in-memory images.
+
+        Skips the source detection and dataset construction of `__call__`: the image size and transforms are resolved
+        once per args, and the images go straight through preprocess, inference and postprocess. The Results are the
+        same as those of `__call__` on the same images, but they are not visualized, saved or logged, and the
+        predict callbacks are not run.
+
+        Args:
+            im (np.ndarray | List(np.ndarray)): An HWC BGR image or a list of them, predicted as one batch.
+
+        Returns:
+            (List[ultralytics.engine.results.Results]): One Results per image.
+        """
+        im0s = [im] if isinstance(im, np.ndarray) else list(im)
+        with self._lock:  # for thread-safe inference
+            if self.array_args is not self.args:  # args changed since the last call
+                self.setup_transforms()
+                self.array_args = self.args
+            self.source_type = SourceTypes(from_img=True)
+            if not self.done_warmup:
+                self.model.warmup(imgsz=(1 if self.model.pt or self.model.triton else len(im0s), 3, *self.imgsz))
+                self.done_warmup = True
+
+            self.batch = [f'image{i}.jpg' for i in range(len(im0s))], im0s, None, ''
+            profilers = ops.Profile(), ops.Profile(), ops.Profile()
+            with profilers[0]:
+                im = self.preprocess(im0s)
+            buffer, self._batch_buffer = self._batch_buffer, None
+            with profilers[1]:
+                preds = self.inference(im)
+            with profilers[2]:
+                self.results = self.postprocess(preds, im, im0s)
+            self.release_batch(buffer)
+
+            n = len(im0s)
+            for result in self.results:
+                result.speed = {
+                    'preprocess': profilers[0].dt * 1E3 / n,
+                    'inference': profilers[1].dt * 1E3 / n,
+                    'postprocess': profilers[2].dt * 1E3 / n}
+            return self.results
+
     @smart_inference_mode()
     def stream_inference(self, source=None, model=None, *args, **kwargs):
         """Streams real-time inference on camera feed and saves results to file."""
@@ -251,21 +364,30 @@ class BasePredictor:
             self.seen, self.windows, self.batch, profilers = 0, [], None, (ops.Profile(), ops.Profile(), ops.Profile())
             self.run_callbacks('on_predict_start')
 
-            for batch in self.dataset:
+            pipelined = self.args.pipeline and not self.args.embed and not self.args.visualize
+            for item in self.pipelined_batches(profilers, *args, **kwargs) if pipelined else self.dataset:
+                if pipelined:  # loaded, preprocessed and inferred ahead by the pipeline threads
+                    batch, self.dataset_state, im, preds, buffer, dt = item
+                else:
+                    batch, self.dataset_state = item, self.get_dataset_state()
                 self.run_callbacks('on_predict_batch_start')
                 self.batch = batch
                 path, im0s, vid_cap, s = batch
 
-                # Preprocess
-                with profilers[0]:
-                    im = self.preprocess(im0s)
-
-                # Inference
-                with profilers[1]:
-                    preds = self.inference(im, *args, **kwargs)
-                    if self.args.embed:
-                        yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
-                        continue
+                if not pipelined:
+                    # Preprocess
+                    with profilers[0]:
+                        im = self.preprocess(im0s)
+                    buffer, self._batch_buffer = self._batch_buffer, None
+
+                    # Inference
+                    with profilers[1]:
+                        preds = self.inference(im, *args, **kwargs)
+                        if self.args.embed:
+                            self.release_batch(buffer)
+                            yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
+                            continue
+                    dt = profilers[0].dt, profilers[1].dt
 
                 # Postprocess
                 with profilers[2]:
@@ -277,8 +399,8 @@ class BasePredictor:
                 for i in range(n):
                     self.seen += 1
                     self.results[i].speed = {
-                        'preprocess': profilers[0].dt * 1E3 / n,
-                        'inference': profilers[1].dt * 1E3 / n,
+                        'preprocess': dt[0] * 1E3 / n,
+                        'inference': dt[1] * 1E3 / n,
                         'postprocess': profilers[2].dt * 1E3 / n}
                     p, im0 = path[i], None if self.source_type.tensor else im0s[i].copy()
                     p = Path(p)
@@ -292,12 +414,13 @@ class BasePredictor:
                     if self.args.save and self.plotted_img is not None:
                         self.save_preds(vid_cap, i, str(self.save_dir / p.name))
 
+                self.release_batch(buffer)
                 self.run_callbacks('on_predict_batch_end')
                 yield from self.results
 
                 # Print time (inference-only)
                 if self.args.verbose:
-                    LOGGER.info(f'{s}{profilers[1].dt * 1E3:.1f}ms')
+                    LOGGER.info(f'{s}{dt[1] * 1E3:.1f}ms')
 
         # Release assets
         if isinstance(self.vid_writer[-1], cv2.VideoWriter):
@@ -315,6 +438,93 @@ class BasePredictor:
 
         self.run_callbacks('on_predict_end')
 
+    def pipelined_batches(self, profilers, *args, **kwargs):
+        """
+        Yields the batches of the dataset with loading, preprocessing and inference running ahead in background threads.
+
+        One thread loads and preprocesses the batches, a second one runs them through the model, and the caller
+        postprocesses them, so consecutive batches overlap in the three stages. The stages are connected by bounded
+        FIFO queues, so batches come out in dataset order and at most PIPELINE_DEPTH batches wait between stages.
+
+        Args:
+            profilers (tuple): The preprocess, inference and postprocess profilers of `stream_inference`.
+
+        Yields:
+            (tuple): (batch, dataset state, preprocessed images, predictions, pooled batch buffer or None, stage
+                seconds), where dataset state is the `get_dataset_state()` of the batch when it was loaded and stage
+                seconds is the (preprocess, inference) duration of the batch.
+        """
+        # Outputs must outlive the batches queued behind them, also when `pipeline` was enabled after setup_model()
+        self.model.output_buffers = max(self.model.output_buffers, ORT_OUTPUT_BUFFERS)
+        stop = threading.Event()
+        preprocessed, inferred = queue.Queue(PIPELINE_DEPTH), queue.Queue(PIPELINE_DEPTH)
+
+        def put(q, item):
+            """Put an item in a bounded queue, giving up once the pipeline is stopped."""
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(q):
+            """Get the next item of a queue, or None once the pipeline is stopped."""
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+        def preprocess_stage():
+            try:
+                for batch in self.dataset:
+                    state = self.get_dataset_state()  # taken before the dataset moves on to the next batch
+                    with profilers[0]:
+                        im = self.preprocess(batch[1])
+                    buffer, self._batch_buffer = self._batch_buffer, None
+                    if not put(preprocessed, (batch, state, im, buffer, profilers[0].dt)):
+                        return
+            except Exception as e:
+                put(preprocessed, e)
+            else:
+                put(preprocessed, None)  # end of the dataset
+
+        def inference_stage():
+            while True:
+                item = get(preprocessed)
+                if item is None or isinstance(item, Exception):
+                    put(inferred, item)
+                    return
+                batch, state, im, buffer, dt = item
+                try:
+                    with profilers[1]:
+                        preds = self.inference(im, *args, **kwargs)
+                except Exception as e:
+                    put(inferred, e)
+                    return
+                if not put(inferred, (batch, state, im, preds, buffer, (dt, profilers[1].dt))):
+                    return
+
+        grad_mode = torch.inference_mode if TORCH_1_9 else torch.no_grad  # thread-local, entered in each stage thread
+        threads = [threading.Thread(target=grad_mode()(stage), name=f'predict_{stage.__name__}', daemon=True)
+                   for stage in (preprocess_stage, inference_stage)]
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = inferred.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()  # also stops the threads when the caller stops iterating early
+            for thread in threads:
+                thread.join()
+
     def setup_model(self, model, verbose=True):
         """Initialize YOLO model with given parameters and set it to evaluation mode."""
         self.model = AutoBackend(model or self.args.model,
@@ -323,7 +533,10 @@ class BasePredictor:
                                  data=self.args.data,
                                  fp16=self.args.half,
                                  fuse=True,
-                                 verbose=verbose)
+                                 verbose=verbose,
+                                 intra_op_threads=self.args.intra_op_threads or 0,
+                                 inter_op_threads=self.args.inter_op_threads or 0,
+                                 output_buffers=ORT_OUTPUT_BUFFERS if self.args.pipeline else 1)
 
         self.device = self.model.device  # update device
         self.args.half = self.model.fp16  # update half
@@ -343,7 +556,7 @@ class BasePredictor:
         """Save video predictions as mp4 at specified path."""
         im0 = self.plotted_img
         # Save imgs
-        if self.dataset.mode == 'image':
+        if (self.dataset_state or self.get_dataset_state())[2] == 'image':
             cv2.imwrite(save_path, im0)
         else:  # 'video' or 'stream'
             frames_path = f'{save_path.split(".", 1)[0]}_frames/'
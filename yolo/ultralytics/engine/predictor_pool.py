@@ -0,0 +1,146 @@
+# Ultralytics YOLO 🚀, AGPL-3.0 license
+"""
+Pool of predictors of one model for concurrent, thread-safe inference.
+
+A single predictor serializes every call on its lock, so threads of a server calling `model.predict()` run one at a
+time. A PredictorPool holds K predictors that each have their own state (dataset, video writers, results, letterbox
+buffers) and hands each call to an idle one, so up to K calls run in parallel.
+
+Usage:
+    from ultralytics import YOLO
+    from ultralytics.engine.predictor_pool import PredictorPool
+
+    pool = PredictorPool(YOLO('yolov8n.pt'), size=4, imgsz=640, verbose=False)
+    results = pool.predict(source=image, conf=0.25)  # from any number of threads
+"""
+
+import copy
+import os
+import queue
+import types
+from contextlib import contextmanager
+
+from torch import nn
+
+
+def clone_module(module):
+    """
+    Copy a module tree without copying its weights.
+
+    Every submodule gets its own instance (and so its own attributes, e.g. the anchor cache of a Detect head), while
+    parameters and buffers stay the same tensors as in the original.
+
+    Args:
+        module (nn.Module): The module to clone.
+
+    Returns:
+        (nn.Module): The clone, sharing the parameters and buffers of `module`.
+    """
+    clone = copy.copy(module)
+    clone._parameters = dict(module._parameters)
+    clone._buffers = dict(module._buffers)
+    clone._modules = {name: None if child is None else clone_module(child) for name, child in module._modules.items()}
+    for name, value in vars(module).items():
+        if isinstance(value, types.MethodType) and value.__self__ is module:  # e.g. forward = forward_fuse
+            setattr(clone, name, types.MethodType(value.__func__, clone))
+    return clone
+
+
+def default_pool_size():
+    """Number of predictors of a pool created with size 0: one per 4 CPU cores, at most 4."""
+    return max(1, min(4, (os.cpu_count() or 1) // 4))
+
+
+class PredictorPool:
+    """
+    K predictors of one model, sharing its read-only weights, that serve concurrent calls in parallel.
+
+    PyTorch models are set up once and cloned with `clone_module()`, so every predictor runs the same weight tensors.
+    Exported models (ONNX, OpenVINO, ...) get one runtime session per predictor, each limited to its share of the CPU
+    cores through `intra_op_threads`.
+
+    Attributes:
+        size (int): Number of predictors, i.e. calls that run in parallel.
+        predictors (list): The predictors of the pool.
+    """
+
+    def __init__(self, model, size=0, **kwargs):
+        """
+        Create and set up the predictors.
+
+        Args:
+            model (Model): The model to predict with, e.g. YOLO('yolov8n.pt').
+            size (int): Number of predictors, 0 for `default_pool_size()`.
+            **kwargs: Predict arguments fixed for the pool (device, half, imgsz, intra_op_threads, ...). With
+                intra_op_threads 0, exported models split the CPU cores evenly across the predictors.
+        """
+        self.size = size if size > 0 else default_pool_size()
+        args = {**model.overrides, 'conf': 0.25, 'save': False, **kwargs, 'mode': 'predict'}
+        if not args.get('intra_op_threads'):
+            args['intra_op_threads'] = max(1, (os.cpu_count() or 1) // self.size)
+
+        self.predictors = []
+        shared = None  # set-up PyTorch module the other predictors are cloned from
+        for _ in range(self.size):
+            predictor = model._smart_load('predictor')(overrides=args, _callbacks=model.callbacks)
+            predictor.setup_model(model=clone_module(shared) if shared is not None else model.model, verbose=False)
+            if isinstance(predictor.model.model, nn.Module):
+                shared = predictor.model.model
+            self.predictors.append(predictor)
+
+        self._idle = queue.Queue()
+        for predictor in self.predictors:
+            self._idle.put(predictor)
+
+    @contextmanager
+    def acquire(self):
+        """Borrow an idle predictor for the duration of the context, waiting for one if all of them are busy."""
+        predictor = self._idle.get()
+        try:
+            yield predictor
+        finally:
+            self._idle.put(predictor)
+
+    def predict(self, source=None, stream=False, **kwargs):
+        """
+        Run prediction on an idle predictor, same as `Model.predict()`.
+
+        Args:
+            source (str | int | PIL | np.ndarray | list): The source to make predictions on.
+            stream (bool): Return a generator of Results, which holds its predictor until it is exhausted or closed.
+            **kwargs: Additional predict arguments of this call.
+
+        Returns:
+            (List[ultralytics.engine.results.Results]): The prediction results.
+        """
+        if stream:
+            return self._stream(source, **kwargs)
+        with self.acquire() as predictor:
+            predictor.update_args(kwargs)
+            return predictor(source=source, stream=False)
+
+    def predict_array(self, source, **kwargs):
+        """
+        Low-overhead prediction on in-memory images on an idle predictor, see `BasePredictor.predict_array()`.
+
+        Args:
+            source (np.ndarray | List(np.ndarray)): An HWC BGR image or a list of them, predicted as one batch.
+            **kwargs: Additional predict arguments of this call.
+
+        Returns:
+            (List[ultralytics.engine.results.Results]): One Results per image.
+        """
+        with self.acquire() as predictor:
+            predictor.update_args(kwargs)
+            return predictor.predict_array(source)
+
+    def warmup(self, source, **kwargs):
+        """Run in-memory images once through every predictor, so none of them pays first-call initialization later."""
+        for _ in range(self.size):  # idle predictors are handed out in turn
+            self.predict_array(source, **kwargs)
+
+    def _stream(self, source, **kwargs):
+        """Generator of Results holding a predictor while it is being consumed."""
+        with self.acquire() as predictor:
+            predictor.update_args(kwargs)
+            yield from predictor(source=source, stream=True)
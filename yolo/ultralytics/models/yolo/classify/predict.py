@@ -46,5 +46,6 @@ class ClassificationPredictor(BasePredictor):
         for i, pred in enumerate(preds):
             orig_img = orig_imgs[i]
             img_path = self.batch[0][i]
-            results.append(Results(orig_img, path=img_path, names=self.model.names, probs=pred))
+            # Copied, the outputs of exported models live in buffers that are reused by later batches
+            results.append(Results(orig_img, path=img_path, names=self.model.names, probs=pred.clone()))
         return results
@@ -18,6 +18,11 @@ from ultralytics.utils import ARM64, LINUX, LOGGER, ROOT, yaml_load
 from ultralytics.utils.checks import check_requirements, check_suffix, check_version, check_yaml
 from ultralytics.utils.downloads import attempt_download_asset, is_url
 
+# Output tensor sets per input shape reused in turn by ONNX Runtime IO binding when the predictor is pipelined, enough
+# for the batch being postprocessed and the PIPELINE_DEPTH batches queued behind it while the next one is inferred
+ORT_OUTPUT_BUFFERS = 4
+ORT_OUTPUT_SHAPES = 8  # input shapes with preallocated outputs, the least recently used one is dropped beyond that
+
 
 def check_class_names(names):
     """
@@ -84,7 +89,10 @@ class AutoBackend(nn.Module):
                  data=None,
                  fp16=False,
                  fuse=True,
-                 verbose=True):
+                 verbose=True,
+                 intra_op_threads=0,
+                 inter_op_threads=0,
+                 output_buffers=1):
         """
         Initialize the AutoBackend for inference.
 
@@ -96,6 +104,11 @@ class AutoBackend(nn.Module):
             fp16 (bool): Enable half-precision inference. Supported only on specific backends. Defaults to False.
             fuse (bool): Fuse Conv2D + BatchNorm layers for optimization. Defaults to True.
             verbose (bool): Enable verbose logging. Defaults to True.
+            intra_op_threads (int): ONNX Runtime / OpenVINO threads per operator, 0 lets the runtime decide.
+            inter_op_threads (int): ONNX Runtime threads for independent operators, 0 lets the runtime decide.
+            output_buffers (int): ONNX Runtime output tensor sets reused in turn per input shape, i.e. how many calls
+                the outputs of a call stay valid for. 1 when they are consumed before the next call, ORT_OUTPUT_BUFFERS
+                for the pipelined predictor.
         """
         super().__init__()
         w = str(weights[0] if isinstance(weights, list) else weights)
@@ -156,8 +169,17 @@ class AutoBackend(nn.Module):
             check_requirements(('onnx', 'onnxruntime-gpu' if cuda else 'onnxruntime'))
             import onnxruntime
             providers = ['CUDAExecutionProvider', 'CPUExecutionProvider'] if cuda else ['CPUExecutionProvider']
-            session = onnxruntime.InferenceSession(w, providers=providers)
+            session_options = onnxruntime.SessionOptions()
+            if intra_op_threads > 0:
+                session_options.intra_op_num_threads = intra_op_threads
+            if inter_op_threads > 0:
+                session_options.inter_op_num_threads = inter_op_threads
+                if inter_op_threads > 1:  # inter-op threads are only used in parallel execution mode
+                    session_options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+            session = onnxruntime.InferenceSession(w, sess_options=session_options, providers=providers)
             output_names = [x.name for x in session.get_outputs()]
+            io_binding = session.io_binding()  # inputs read in place, outputs written to preallocated tensors
+            ort_outputs = OrderedDict()  # (input shape, dtype) -> ring of preallocated output tensors, see _run_onnx()
             metadata = session.get_modelmeta().custom_metadata_map  # metadata
         elif xml:  # OpenVINO
             LOGGER.info(f'Loading {w} for OpenVINO inference...')
@@ -173,7 +195,9 @@ class AutoBackend(nn.Module):
             batch_dim = get_batch(ov_model)
             if batch_dim.is_static:
                 batch_size = batch_dim.get_length()
-            ov_compiled_model = core.compile_model(ov_model, device_name='AUTO')  # AUTO selects best available device
+            ov_config = {'INFERENCE_NUM_THREADS': str(intra_op_threads)} if intra_op_threads > 0 else {}
+            ov_compiled_model = core.compile_model(ov_model, device_name='AUTO',
+                                                   config=ov_config)  # AUTO selects best available device
             metadata = w.parent / 'metadata.yaml'
         elif engine:  # TensorRT
             LOGGER.info(f'Loading {w} for TensorRT inference...')
@@ -361,8 +385,7 @@ class AutoBackend(nn.Module):
             self.net.setInput(im)
             y = self.net.forward()
         elif self.onnx:  # ONNX Runtime
-            im = im.cpu().numpy()  # torch to numpy
-            y = self.session.run(self.output_names, {self.session.get_inputs()[0].name: im})
+            y = self._run_onnx(im)
         elif self.xml:  # OpenVINO
             im = im.cpu().numpy()  # FP32
             y = list(self.ov_compiled_model(im).values())
@@ -460,9 +483,58 @@ class AutoBackend(nn.Module):
         else:
             return self.from_numpy(y)
 
+    def _run_onnx(self, im):
+        """
+        Run ONNX Runtime through IO binding, without copying the input or allocating the outputs.
+
+        The first call for an input shape runs the session normally to learn the output shapes. Later calls bind the
+        input tensor in place and write the outputs into a ring of `output_buffers` preallocated tensor sets for that
+        shape. A ring slot is only overwritten `output_buffers` calls later, so with the pipelined
+        `BasePredictor.stream_inference` the outputs of a batch stay valid while the next batches are inferred. Rings
+        are kept for the ORT_OUTPUT_SHAPES most recently used input shapes.
+
+        Args:
+            im (torch.Tensor): The BCHW input batch.
+
+        Returns:
+            (list): The output tensors, on the model device.
+        """
+        on_cuda = self.session.get_providers()[0] == 'CUDAExecutionProvider'
+        im = im.to(self.device if on_cuda else 'cpu').contiguous()
+        input_name = self.session.get_inputs()[0].name
+        key = (tuple(im.shape), im.dtype)
+        ring = self.ort_outputs.get(key)
+        if ring is None:
+            y = self.session.run(self.output_names, {input_name: im.cpu().numpy()})
+            self.ort_outputs[key] = {'shapes': [x.shape for x in y], 'dtypes': [x.dtype for x in y], 'buffers': [],
+                                     'next': 0}
+            while len(self.ort_outputs) > ORT_OUTPUT_SHAPES:
+                self.ort_outputs.popitem(last=False)
+            return [self.from_numpy(x) for x in y]
+
+        self.ort_outputs.move_to_end(key)
+        buffers = ring['buffers']
+        if ring['next'] == len(buffers):  # ring slots are allocated on first use
+            buffers.append([torch.from_numpy(np.empty(shape, dtype)).to(im.device)
+                            for shape, dtype in zip(ring['shapes'], ring['dtypes'])])
+        outputs = buffers[ring['next']]
+        ring['next'] = (ring['next'] + 1) % self.output_buffers
+        device_type, device_id = ('cuda', im.device.index or 0) if on_cuda else ('cpu', 0)
+        binding = self.io_binding
+        binding.bind_input(input_name, device_type, device_id, np.float16 if im.dtype == torch.float16 else np.float32,
+                           tuple(im.shape), im.data_ptr())
+        for name, dtype, x in zip(self.output_names, ring['dtypes'], outputs):
+            binding.bind_output(name, device_type, device_id, dtype, tuple(x.shape), x.data_ptr())
+        self.session.run_with_iobinding(binding)
+        return [x.to(self.device) for x in outputs]
+
     def from_numpy(self, x):
         """
-        Convert a numpy array to a tensor.
+        Convert a numpy array to a tensor on the model device.
+
+        The tensor aliases the array instead of copying it whenever torch can wrap it (a writeable array with a
+        native-endian dtype torch supports). The backends return arrays that are their own, i.e. not reused by the
+        runtime for later calls, so the memory is safe to share; only moving it to a CUDA device copies.
 
         Args:
             x (np.ndarray): The array to be converted.
@@ -470,7 +542,12 @@ class AutoBackend(nn.Module):
         Returns:
             (torch.Tensor): The converted tensor
         """
-        return torch.tensor(x).to(self.device) if isinstance(x, np.ndarray) else x
+        if not isinstance(x, np.ndarray):
+            return x
+        if x.flags.writeable and x.dtype.isnative:
+            with contextlib.suppress(TypeError, ValueError):  # dtypes torch doesn't support, negative strides
+                return torch.from_numpy(x).to(self.device)
+        return torch.tensor(x).to(self.device)
 
     def warmup(self, imgsz=(1, 3, 640, 640)):
         """